@@ -5,13 +5,13 @@ Interface Streamlit para extração e validação de dados via PDF/imagem.
 """
 
 import os
-import tempfile
+import shutil
 import streamlit as st
-from pathlib import Path
-from pdfminer.high_level import extract_text as extract_text_pdf
+from concurrent.futures import ThreadPoolExecutor
+from os.path import basename
 
-from crm_pipeline      import executar_pipeline
-from contract_pipeline import executar_pipeline_contrato
+# tempfile e os pipelines (que arrastam anthropic/pdfminer) são importados
+# apenas dentro do fluxo de validação, para não pesar no cold start da UI.
 
 
 # --------------------------------------------------------------------------- #
@@ -30,372 +30,44 @@ st.set_page_config(
 # CSS personalizado                                                            #
 # --------------------------------------------------------------------------- #
 
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Syne:wght@400;600;700;800&family=DM+Mono:wght@300;400;500&display=swap');
+@st.cache_resource
+def _carregar_css() -> str:
+    """Lê o arquivo de CSS uma única vez por processo e devolve o bloco <style> pronto."""
+    caminho_css = os.path.join(os.path.dirname(__file__), "styles.css")
+    with open(caminho_css, encoding="utf-8") as f:
+        css = f.read()
+    return f"<style>\n{css}</style>"
 
-/* Base */
-html, body, [class*="css"] {
-    font-family: 'DM Mono', monospace;
-}
-
-/* Fundo */
-.stApp {
-    background-color: #0a0a0f;
-    background-image:
-        radial-gradient(ellipse 80% 50% at 50% -10%, rgba(99, 57, 255, 0.18) 0%, transparent 60%),
-        radial-gradient(ellipse 40% 30% at 90% 80%, rgba(255, 87, 51, 0.08) 0%, transparent 50%);
-}
-
-/* Títulos */
-h1, h2, h3 {
-    font-family: 'Syne', sans-serif !important;
-}
-
-/* Header principal */
-.gamefik-header {
-    text-align: center;
-    padding: 3rem 0 2rem;
-    border-bottom: 1px solid rgba(99, 57, 255, 0.3);
-    margin-bottom: 2.5rem;
-}
-
-.gamefik-logo {
-    font-family: 'Syne', sans-serif;
-    font-size: 0.75rem;
-    font-weight: 700;
-    letter-spacing: 0.35em;
-    color: #6339ff;
-    text-transform: uppercase;
-    margin-bottom: 0.5rem;
-}
-
-.gamefik-title {
-    font-family: 'Syne', sans-serif;
-    font-size: 2.6rem;
-    font-weight: 800;
-    color: #f0eeff;
-    line-height: 1.1;
-    margin: 0;
-}
-
-.gamefik-title span {
-    color: #6339ff;
-}
-
-.gamefik-subtitle {
-    color: rgba(240, 238, 255, 0.4);
-    font-size: 0.8rem;
-    margin-top: 0.75rem;
-    letter-spacing: 0.05em;
-}
-
-/* Cards */
-.card {
-    background: rgba(255, 255, 255, 0.03);
-    border: 1px solid rgba(99, 57, 255, 0.2);
-    border-radius: 12px;
-    padding: 1.5rem;
-    margin-bottom: 1.25rem;
-}
-
-.card-title {
-    font-family: 'Syne', sans-serif;
-    font-size: 0.7rem;
-    font-weight: 700;
-    letter-spacing: 0.2em;
-    color: #6339ff;
-    text-transform: uppercase;
-    margin-bottom: 1rem;
-    display: flex;
-    align-items: center;
-    gap: 0.5rem;
-}
-
-/* Arquivo tag */
-.file-tag {
-    display: inline-flex;
-    align-items: center;
-    gap: 0.4rem;
-    background: rgba(99, 57, 255, 0.12);
-    border: 1px solid rgba(99, 57, 255, 0.3);
-    border-radius: 6px;
-    padding: 0.3rem 0.7rem;
-    font-size: 0.78rem;
-    color: #c4b8ff;
-    margin: 0.2rem;
-}
-
-.file-tag.error {
-    background: rgba(255, 69, 58, 0.1);
-    border-color: rgba(255, 69, 58, 0.3);
-    color: #ff8b82;
-}
-
-/* Tabela de dados */
-.data-table {
-    width: 100%;
-    border-collapse: collapse;
-}
-
-.data-table tr {
-    border-bottom: 1px solid rgba(255, 255, 255, 0.04);
-}
-
-.data-table tr:last-child {
-    border-bottom: none;
-}
-
-.data-table td {
-    padding: 0.55rem 0.5rem;
-    font-size: 0.8rem;
-    vertical-align: top;
-}
-
-.data-table td:first-child {
-    color: rgba(240, 238, 255, 0.4);
-    width: 38%;
-    letter-spacing: 0.03em;
-}
-
-.data-table td:last-child {
-    color: #f0eeff;
-    font-weight: 400;
-}
-
-.data-table td.null-value {
-    color: rgba(240, 238, 255, 0.2);
-    font-style: italic;
-}
-
-/* Status badges */
-.badge-valido {
-    display: inline-flex;
-    align-items: center;
-    gap: 0.4rem;
-    background: rgba(52, 199, 89, 0.12);
-    border: 1px solid rgba(52, 199, 89, 0.4);
-    color: #34c759;
-    border-radius: 100px;
-    padding: 0.4rem 1rem;
-    font-family: 'Syne', sans-serif;
-    font-weight: 700;
-    font-size: 0.85rem;
-    letter-spacing: 0.08em;
-}
 
-.badge-invalido {
-    display: inline-flex;
-    align-items: center;
-    gap: 0.4rem;
-    background: rgba(255, 69, 58, 0.12);
-    border: 1px solid rgba(255, 69, 58, 0.4);
-    color: #ff453a;
-    border-radius: 100px;
-    padding: 0.4rem 1rem;
-    font-family: 'Syne', sans-serif;
-    font-weight: 700;
-    font-size: 0.85rem;
-    letter-spacing: 0.08em;
-}
-
-.badge-revisao {
-    display: inline-flex;
-    align-items: center;
-    gap: 0.4rem;
-    background: rgba(255, 159, 10, 0.12);
-    border: 1px solid rgba(255, 159, 10, 0.4);
-    color: #ff9f0a;
-    border-radius: 100px;
-    padding: 0.4rem 1rem;
-    font-family: 'Syne', sans-serif;
-    font-weight: 700;
-    font-size: 0.85rem;
-    letter-spacing: 0.08em;
-}
-
-/* Lista de erros */
-.error-item {
-    display: flex;
-    align-items: flex-start;
-    gap: 0.6rem;
-    padding: 0.6rem 0.8rem;
-    background: rgba(255, 69, 58, 0.07);
-    border-left: 2px solid #ff453a;
-    border-radius: 0 6px 6px 0;
-    margin-bottom: 0.5rem;
-    font-size: 0.8rem;
-    color: #ff8b82;
-}
-
-.error-dot {
-    color: #ff453a;
-    font-size: 0.6rem;
-    margin-top: 0.25rem;
-    flex-shrink: 0;
-}
-
-/* Warning item */
-.warning-item {
-    display: flex;
-    align-items: flex-start;
-    gap: 0.6rem;
-    padding: 0.6rem 0.8rem;
-    background: rgba(255, 159, 10, 0.07);
-    border-left: 2px solid #ff9f0a;
-    border-radius: 0 6px 6px 0;
-    margin-bottom: 0.5rem;
-    font-size: 0.8rem;
-    color: #ffcc60;
-}
-
-/* Info row para contrato */
-.info-row {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    padding: 0.45rem 0;
-    border-bottom: 1px solid rgba(255,255,255,0.04);
-    font-size: 0.8rem;
-}
-
-.info-row:last-child { border-bottom: none; }
-.info-label { color: rgba(240,238,255,0.4); }
-.info-value { color: #f0eeff; }
-
-/* Risco badges */
-.risco-baixo  { color: #34c759; }
-.risco-medio  { color: #ff9f0a; }
-.risco-alto   { color: #ff453a; }
-
-/* Cláusula tag */
-.clausula-tag {
-    display: inline-block;
-    background: rgba(255, 69, 58, 0.1);
-    border: 1px solid rgba(255, 69, 58, 0.25);
-    border-radius: 4px;
-    padding: 0.15rem 0.5rem;
-    font-size: 0.75rem;
-    color: #ff8b82;
-    margin: 0.15rem;
-}
-
-.clausula-tag.extra {
-    background: rgba(255, 159, 10, 0.1);
-    border-color: rgba(255, 159, 10, 0.25);
-    color: #ffcc60;
-}
+# Reemitido em todo rerun: o Streamlit descarta elementos que não são
+# reenviados, então condicionar a injeção deixaria a página sem estilo a
+# partir da primeira interação. A leitura do arquivo continua cacheada.
+st.html(_carregar_css())
 
-.clausula-tag.alterada {
-    background: rgba(99, 57, 255, 0.1);
-    border-color: rgba(99, 57, 255, 0.3);
-    color: #c4b8ff;
-}
-
-/* Banner status geral */
-.status-banner {
-    border-radius: 10px;
-    padding: 1rem 1.5rem;
-    margin-bottom: 1.5rem;
-    display: flex;
-    align-items: center;
-    gap: 1rem;
-    font-family: 'Syne', sans-serif;
-    font-weight: 700;
-    font-size: 0.9rem;
-    letter-spacing: 0.06em;
-}
-
-.status-banner.valido {
-    background: rgba(52, 199, 89, 0.08);
-    border: 1px solid rgba(52, 199, 89, 0.3);
-    color: #34c759;
-}
 
-.status-banner.invalido {
-    background: rgba(255, 69, 58, 0.08);
-    border: 1px solid rgba(255, 69, 58, 0.3);
-    color: #ff453a;
-}
-
-.status-banner.revisao_manual {
-    background: rgba(255, 159, 10, 0.08);
-    border: 1px solid rgba(255, 159, 10, 0.3);
-    color: #ff9f0a;
-}
-
-/* Texto consolidado */
-.text-preview {
-    background: rgba(0, 0, 0, 0.3);
-    border: 1px solid rgba(255, 255, 255, 0.06);
-    border-radius: 8px;
-    padding: 1rem;
-    font-size: 0.75rem;
-    color: rgba(240, 238, 255, 0.5);
-    line-height: 1.7;
-    max-height: 180px;
-    overflow-y: auto;
-    white-space: pre-wrap;
-    word-break: break-word;
-}
-
-/* Divider */
-.section-divider {
-    border: none;
-    border-top: 1px solid rgba(99, 57, 255, 0.15);
-    margin: 2rem 0;
-}
-
-/* Upload area override */
-[data-testid="stFileUploader"] {
-    background: rgba(99, 57, 255, 0.04) !important;
-    border: 1px dashed rgba(99, 57, 255, 0.35) !important;
-    border-radius: 12px !important;
-    padding: 0.5rem !important;
-}
-
-/* Botão */
-.stButton > button {
-    background: #6339ff !important;
-    color: #fff !important;
-    border: none !important;
-    border-radius: 8px !important;
-    font-family: 'Syne', sans-serif !important;
-    font-weight: 700 !important;
-    font-size: 0.9rem !important;
-    letter-spacing: 0.06em !important;
-    padding: 0.65rem 2rem !important;
-    transition: all 0.2s ease !important;
-    width: 100% !important;
-}
-
-.stButton > button:hover {
-    background: #7a55ff !important;
-    transform: translateY(-1px) !important;
-    box-shadow: 0 8px 24px rgba(99, 57, 255, 0.35) !important;
-}
+# --------------------------------------------------------------------------- #
+# Helpers de renderização — CRM (inalterados)                                  #
+# --------------------------------------------------------------------------- #
 
-.stButton > button:active {
-    transform: translateY(0) !important;
-}
+# Tabela de escape para valores não confiáveis (OCR/IA) interpolados em HTML.
+# Um único str.translate em C é mais rápido que os .replace encadeados de
+# html.escape — e fecha o vetor de XSS nos campos extraídos.
+_ESCAPE_HTML = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;",
+})
 
-/* Spinner */
-.stSpinner > div {
-    border-top-color: #6339ff !important;
-}
 
-/* Scrollbar */
-::-webkit-scrollbar { width: 4px; }
-::-webkit-scrollbar-track { background: transparent; }
-::-webkit-scrollbar-thumb { background: rgba(99, 57, 255, 0.4); border-radius: 2px; }
-</style>
-""", unsafe_allow_html=True)
+def _esc(valor) -> str:
+    """Escapa conteúdo não confiável para interpolação segura em HTML."""
+    if valor is None:
+        return ""
+    return str(valor).translate(_ESCAPE_HTML)
 
 
-# --------------------------------------------------------------------------- #
-# Helpers de renderização — CRM (inalterados)                                  #
-# --------------------------------------------------------------------------- #
-
 LABELS = {
     "nome":             "Nome",
     "nome_escola":      "Escola",
@@ -415,56 +87,49 @@ LABELS = {
 }
 
 
-def _render_dados(dados: dict) -> None:
-    rows = ""
-    for campo, label in LABELS.items():
-        valor = dados.get(campo)
-        if valor is None:
-            rows += f'<tr><td>{label}</td><td class="null-value">—</td></tr>'
-        else:
-            rows += f"<tr><td>{label}</td><td>{valor}</td></tr>"
-    st.markdown(
-        f'<table class="data-table"><tbody>{rows}</tbody></table>',
-        unsafe_allow_html=True,
+# Template da tabela montado uma única vez no import — os labels são fixos,
+# então cada render vira um único str.format com os 15 valores.
+_CAMPOS_TABELA = tuple(LABELS)
+_CELULA_NULA   = '<span class="null-value">—</span>'
+_TEMPLATE_TABELA = (
+    '<table class="data-table"><tbody>'
+    + "".join(
+        f"<tr><td>{label}</td><td>{{{i}}}</td></tr>"
+        for i, label in enumerate(LABELS.values())
     )
+    + "</tbody></table>"
+)
 
 
-def _render_resultado(resultado: dict) -> None:
+def _html_dados(dados: dict) -> str:
+    valores = [
+        _CELULA_NULA if dados.get(campo) is None else _esc(dados[campo])
+        for campo in _CAMPOS_TABELA
+    ]
+    return _TEMPLATE_TABELA.format(*valores)
+
+
+def _html_resultado(resultado: dict) -> str:
     status = resultado["status"]
-    erros  = resultado["erros"]
-
-    if status == "valido":
-        st.markdown(
-            '<div style="margin-bottom:1rem">'
-            '<span class="badge-valido">✓ &nbsp;VÁLIDO</span>'
-            '</div>',
-            unsafe_allow_html=True,
-        )
-    else:
-        st.markdown(
-            '<div style="margin-bottom:1rem">'
-            '<span class="badge-invalido">✗ &nbsp;INVÁLIDO</span>'
-            '</div>',
-            unsafe_allow_html=True,
-        )
-        for erro in erros:
-            st.markdown(
-                f'<div class="error-item">'
-                f'<span class="error-dot">●</span>{erro}'
-                f'</div>',
-                unsafe_allow_html=True,
-            )
+    badge  = _STATUS_BADGE.get(status, _STATUS_BADGE["invalido"])
 
+    partes = [f'<div style="margin-bottom:1rem">{badge}</div>']
+    if status != "valido":
+        partes.extend(_ITEM_ERRO.format(_esc(erro)) for erro in resultado["erros"])
 
-def _render_arquivos(sucessos: list, falhas: list) -> None:
-    html = ""
-    for f in sucessos:
-        nome = Path(f).name
-        html += f'<span class="file-tag">📄 {nome}</span>'
-    for f, motivo in falhas:
-        nome = Path(f).name
-        html += f'<span class="file-tag error" title="{motivo}">⚠ {nome}</span>'
-    st.markdown(html, unsafe_allow_html=True)
+    return "".join(partes)
+
+
+def _html_arquivos(sucessos: list, falhas: list) -> str:
+    # os.path.basename é uma operação simples de string — bem mais barato que
+    # construir um Path por arquivo a cada rerun.
+    return "".join(
+        [f'<span class="file-tag">📄 {_esc(basename(f))}</span>' for f in sucessos]
+        + [
+            f'<span class="file-tag error" title="{_esc(motivo)}">⚠ {_esc(basename(f))}</span>'
+            for f, motivo in falhas
+        ]
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -480,119 +145,224 @@ _STATUS_BADGE = {
 }
 
 
-def _render_contrato(saida_contrato: dict) -> None:
-    """Renderiza o card de resultado do pipeline de contrato."""
+# Fragmentos fixos reutilizados na montagem do card de contrato.
+_ITEM_ERRO    = '<div class="error-item"><span class="error-dot">●</span>{}</div>'
+_ITEM_WARNING = (
+    '<div class="warning-item">'
+    '<span style="color:#ff9f0a;font-size:0.6rem;margin-top:0.25rem">▲</span>{}</div>'
+)
+
+
+def _clausula_tags(marcadores: list, css_class: str = "") -> str:
+    """
+    Monta as tags de cláusulas de uma lista de marcadores em uma única passada.
+
+    O <span> de abertura e o fechamento são constantes por chamada, então um
+    separador pré-formatado + str.join cobre listas longas com um único format,
+    em vez de um f-string por marcador.
+    """
+    if not marcadores:
+        return ""
+    classe  = f"clausula-tag {css_class}".rstrip()
+    prefixo = f'<span class="{classe}">'
+    sep     = f"</span>{prefixo}"
+    return prefixo + sep.join(_esc(m) for m in marcadores) + "</span>"
+
+
+def _html_contrato(saida_contrato: dict) -> str:
+    """
+    Monta o corpo do card de resultado do pipeline de contrato.
+
+    Todo o HTML é retornado como uma única string — o chamador embute o
+    corpo no card e emite um único st.html por card, já que cada chamada
+    separada vira um frame próprio no websocket do Streamlit.
+    """
     vc     = saida_contrato["validacao_campos"]
     status = saida_contrato["status_final"]
     warns  = saida_contrato.get("warnings_crm_contrato", [])
     badge  = _STATUS_BADGE.get(status, "")
 
-    # Status
-    st.markdown(
-        f'<div style="margin-bottom:0.75rem">{badge}</div>',
-        unsafe_allow_html=True,
-    )
+    partes = [f'<div style="margin-bottom:0.75rem">{badge}</div>']
 
     # Erros críticos de campos
     if vc["erros_criticos"]:
-        st.markdown('<div style="margin-top:0.75rem">', unsafe_allow_html=True)
-        for e in vc["erros_criticos"]:
-            st.markdown(
-                f'<div class="error-item"><span class="error-dot">●</span>{e}</div>',
-                unsafe_allow_html=True,
-            )
-        st.markdown('</div>', unsafe_allow_html=True)
+        partes.append('<div style="margin-top:0.75rem">')
+        partes.extend(_ITEM_ERRO.format(_esc(e)) for e in vc["erros_criticos"])
+        partes.append('</div>')
 
     # Warnings de campos (numérico/limiar)
-    if vc["warnings"]:
-        for w in vc["warnings"]:
-            st.markdown(
-                f'<div class="warning-item"><span style="color:#ff9f0a;font-size:0.6rem;margin-top:0.25rem">▲</span>{w}</div>',
-                unsafe_allow_html=True,
-            )
+    partes.extend(_ITEM_WARNING.format(_esc(w)) for w in vc["warnings"])
 
     # Warnings de divergência CRM × contrato
     if warns:
-        st.markdown(
+        partes.append(
             '<div style="margin-top:0.6rem;font-size:0.75rem;color:rgba(240,238,255,0.4);margin-bottom:0.25rem">'
-            'Divergências CRM × Contrato</div>',
-            unsafe_allow_html=True,
+            'Divergências CRM × Contrato</div>'
         )
-        for w in warns:
-            st.markdown(
-                f'<div class="warning-item"><span style="color:#ff9f0a;font-size:0.6rem;margin-top:0.25rem">▲</span>{w}</div>',
-                unsafe_allow_html=True,
-            )
+        partes.extend(_ITEM_WARNING.format(_esc(w)) for w in warns)
 
-    if not any([vc["erros_criticos"], vc["warnings"], warns]):
-        st.markdown(
+    # Cláusulas (presente apenas quando o validador de cláusulas é executado)
+    vcl = saida_contrato.get("validacao_clausulas")
+    if vcl:
+        partes.append(_clausula_tags(vcl.get("clausulas_ausentes", [])))
+        partes.append(_clausula_tags(vcl.get("clausulas_extras", []), "extra"))
+        partes.append(_clausula_tags(vcl.get("clausulas_alteradas", []), "alterada"))
+
+    if not (vc["erros_criticos"] or vc["warnings"] or warns):
+        partes.append(
             '<p style="color:rgba(240,238,255,0.3);font-size:0.78rem;margin-top:0.5rem">'
-            'Nenhum problema encontrado.</p>',
-            unsafe_allow_html=True,
+            'Nenhum problema encontrado.</p>'
         )
 
+    return "".join(partes)
+
 
 # --------------------------------------------------------------------------- #
 # Lógica de separação e consolidação                                           #
 # --------------------------------------------------------------------------- #
 
+def _extrair_texto_pdf(dados_pdf: bytes) -> str:
+    """
+    Extrai o texto do contrato diretamente dos bytes do PDF enviado,
+    sem passar por arquivo temporário.
+
+    Usa PyMuPDF (fitz), significativamente mais rápido que o pdfminer em
+    PDFs de várias páginas. Se o PyMuPDF não estiver instalado ou não
+    retornar texto (ex.: PDF escaneado), recorre ao pdfminer.
+    """
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+
+    if fitz is not None:
+        with fitz.open(stream=dados_pdf, filetype="pdf") as doc:
+            texto = "\n".join(page.get_text("text") for page in doc)
+        if texto.strip():
+            return texto
+
+    import io
+    from pdfminer.high_level import extract_text
+    return extract_text(io.BytesIO(dados_pdf))
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _executar_contrato(dados_pdf: bytes) -> dict:
+    """Extrai o texto do PDF e executa o pipeline de contrato.
+
+    Memoizado por hash dos bytes do PDF: reenviar o mesmo contrato não
+    repete a chamada à API da Anthropic. A comparação CRM × contrato é
+    feita depois, quando o pipeline CRM (executado em paralelo) também
+    tiver terminado.
+    """
+    from contract_pipeline import executar_pipeline_contrato
+
+    texto_contrato = _extrair_texto_pdf(dados_pdf)
+    # Basta inspecionar um prefixo limitado para detectar PDF sem texto:
+    # strip() no documento inteiro faria uma cópia O(N) só para esse teste.
+    if not texto_contrato or not texto_contrato[:512].strip():
+        raise ValueError("O PDF do contrato não contém texto legível.")
+    return executar_pipeline_contrato(texto_contrato=texto_contrato)
+
+
+def _salvar_upload(uf, destino: str) -> None:
+    """
+    Grava um UploadedFile em disco em blocos de 1MB.
+
+    Evita o getbuffer(), que materializa o arquivo inteiro em memória e
+    dobra o pico de RSS com PDFs e fotos grandes.
+    """
+    uf.seek(0)
+    with open(destino, "wb", buffering=1024 * 1024) as f:
+        shutil.copyfileobj(uf, f, length=1024 * 1024)
+
+
 def _separar_arquivos(uploaded_files) -> tuple[list, list]:
     """Retorna (imagens, pdfs) separados por extensão."""
     imagens, pdfs = [], []
     for uf in uploaded_files:
-        ext = Path(uf.name).suffix.lower()
-        if ext == ".pdf":
+        if uf.name.lower().endswith(".pdf"):
             pdfs.append(uf)
         else:
             imagens.append(uf)
     return imagens, pdfs
 
 
+def _separar_arquivos_cached(uploaded_files) -> tuple[list, list]:
+    """
+    Versão memoizada de _separar_arquivos, com cache em session_state.
+
+    A separação é chamada no preview e de novo após o clique em Validar,
+    em todo rerun; o cache refaz o trabalho só quando a lista de uploads muda.
+    """
+    # file_id entra na chave: reenviar um arquivo corrigido com o mesmo nome
+    # gera um novo UploadedFile, e a chave só por nome devolveria os objetos
+    # do upload anterior.
+    chave = tuple((uf.name, uf.file_id) for uf in uploaded_files)
+    if st.session_state.get("_sep_chave") != chave:
+        st.session_state._sep_cache = _separar_arquivos(uploaded_files)
+        st.session_state._sep_chave = chave
+    return st.session_state._sep_cache
+
+
+# Matriz de consolidação pré-computada no import. None indica pipeline não
+# executado no modo atual. Regras (ordem de prioridade):
+#     1. CRM inválido                 → "invalido"
+#     2. Contrato inválido            → "invalido"
+#     3. Contrato em revisão manual   → "revisao_manual"
+#     4. Caso contrário               → "valido"
+_MATRIZ_STATUS_GERAL: dict[tuple[str | None, str | None], str] = {
+    (crm, contrato): (
+        "invalido"       if "invalido" in (crm, contrato) else
+        "revisao_manual" if contrato == "revisao_manual"  else
+        "valido"
+    )
+    for crm in (None, "valido", "invalido")
+    for contrato in (None, "valido", "invalido", "revisao_manual")
+}
+
+
 def _status_geral(
     status_crm:      str | None,
     status_contrato: str | None,
 ) -> str:
-    """
-    Consolida os status dos pipelines executados em um único status_geral.
-    Aceita None quando um dos pipelines não foi executado no modo atual.
-
-    Regras (ordem de prioridade):
-        1. CRM inválido                 → "invalido"
-        2. Contrato inválido            → "invalido"
-        3. Contrato em revisão manual   → "revisao_manual"
-        4. Caso contrário               → "valido"
-    """
-    if status_crm == "invalido":
-        return "invalido"
-    if status_contrato == "invalido":
-        return "invalido"
-    if status_contrato == "revisao_manual":
-        return "revisao_manual"
-    return "valido"
+    """Consolida os status dos pipelines executados em um único status_geral."""
+    return _MATRIZ_STATUS_GERAL.get((status_crm, status_contrato), "valido")
 
 
-def _render_banner_status(status: str) -> None:
-    """Exibe o banner de status geral no topo dos resultados."""
-    config = {
-        "valido":         ("✔", "APROVADO — Todos os dados validados com sucesso"),
-        "invalido":       ("✘", "REPROVADO — Foram encontrados erros críticos"),
-        "revisao_manual": ("⚠", "REVISÃO MANUAL — Divergências ou alertas encontrados"),
-    }
-    icone, texto = config.get(status, ("?", status.upper()))
-    st.markdown(
+# Banners prontos por status, montados uma única vez no import.
+_BANNER_HTML = {
+    status: (
         f'<div class="status-banner {status}">'
         f'<span style="font-size:1.2rem">{icone}</span>'
         f'<span>{texto}</span>'
-        f'</div>',
-        unsafe_allow_html=True,
+        f'</div>'
     )
+    for status, icone, texto in [
+        ("valido",         "✔", "APROVADO — Todos os dados validados com sucesso"),
+        ("invalido",       "✘", "REPROVADO — Foram encontrados erros críticos"),
+        ("revisao_manual", "⚠", "REVISÃO MANUAL — Divergências ou alertas encontrados"),
+    ]
+}
+
+
+def _render_banner_status(status: str) -> None:
+    """Exibe o banner de status geral no topo dos resultados."""
+    banner = _BANNER_HTML.get(status)
+    if banner is None:
+        banner = (
+            f'<div class="status-banner {status}">'
+            f'<span style="font-size:1.2rem">?</span>'
+            f'<span>{status.upper()}</span>'
+            f'</div>'
+        )
+    st.html(banner)
 
 
 def _render_erro_inline(titulo: str, mensagem: str) -> None:
-    st.markdown(
+    st.html(
         f'<div class="card"><div class="card-title">⚠ {titulo}</div>'
         f'<div class="error-item"><span class="error-dot">●</span>{mensagem}</div></div>',
-        unsafe_allow_html=True,
     )
 
 
@@ -600,20 +370,50 @@ def _render_erro_inline(titulo: str, mensagem: str) -> None:
 # Interface principal                                                          #
 # --------------------------------------------------------------------------- #
 
-# Header
-st.markdown("""
+# Blocos estáticos construídos uma única vez por processo.
+@st.cache_resource
+def _header_html() -> str:
+    return """
 <div class="gamefik-header">
     <div class="gamefik-logo">🎮 Gamefik</div>
     <h1 class="gamefik-title">Validador de <span>CRM</span></h1>
     <p class="gamefik-subtitle">Extração e validação automática de dados via IA · PDF & Imagens</p>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def _vazio_html() -> str:
+    return """
+<div style="
+    display:flex;
+    flex-direction:column;
+    align-items:center;
+    justify-content:center;
+    height:320px;
+    color:rgba(240,238,255,0.15);
+    text-align:center;
+    gap:0.75rem;
+">
+    <div style="font-size:2.5rem">📂</div>
+    <div style="font-family:'Syne',sans-serif;font-size:0.85rem;letter-spacing:0.08em">
+        NENHUM ARQUIVO ENVIADO
+    </div>
+    <div style="font-size:0.72rem;max-width:240px;line-height:1.6">
+        Envie as imagens do CRM e o PDF do contrato para iniciar a validação
+    </div>
+</div>
+"""
+
+
+# Header
+st.html(_header_html())
 
 # Layout em colunas
 col_upload, col_result = st.columns([1, 1.6], gap="large")
 
 with col_upload:
-    st.markdown('<div class="card-title">📁 &nbsp;Arquivos</div>', unsafe_allow_html=True)
+    st.html('<div class="card-title">📁 &nbsp;Arquivos</div>')
 
     uploaded_files = st.file_uploader(
         label="Arraste ou selecione arquivos",
@@ -623,19 +423,18 @@ with col_upload:
     )
 
     if uploaded_files:
-        imagens_preview, pdfs_preview = _separar_arquivos(uploaded_files)
-        st.markdown(
+        imagens_preview, pdfs_preview = _separar_arquivos_cached(uploaded_files)
+        st.html(
             f'<p style="color:rgba(240,238,255,0.35);font-size:0.75rem;margin:0.5rem 0 0.25rem">'
             f'{len(uploaded_files)} arquivo(s) &nbsp;·&nbsp; '
             f'{len(imagens_preview)} imagem(ns) &nbsp;·&nbsp; '
             f'{len(pdfs_preview)} PDF(s)</p>',
-            unsafe_allow_html=True,
         )
 
     btn_validar = st.button("▶ &nbsp;Validar", disabled=not uploaded_files)
 
-    st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
-    st.markdown(
+    st.html('<hr class="section-divider">')
+    st.html(
         '<p style="color:rgba(240,238,255,0.2);font-size:0.72rem;line-height:1.6">'
         '<strong style="color:rgba(240,238,255,0.4)">Imagens (JPG, PNG)</strong> → Pipeline CRM<br>'
         '<strong style="color:rgba(240,238,255,0.4)">PDF</strong> → Pipeline Contrato<br><br>'
@@ -643,7 +442,6 @@ with col_upload:
         'Com imagens + PDF a comparação CRM × contrato é ativada.<br><br>'
         'Certifique-se que a variável <code style="color:#6339ff">ANTHROPIC_API_KEY</code> está configurada.'
         '</p>',
-        unsafe_allow_html=True,
     )
 
 
@@ -651,7 +449,13 @@ with col_result:
 
     if btn_validar and uploaded_files:
 
-        imagens, pdfs = _separar_arquivos(uploaded_files)
+        import atexit
+        import tempfile
+
+        from crm_pipeline      import executar_pipeline
+        from contract_pipeline import comparar_crm_contrato
+
+        imagens, pdfs = _separar_arquivos_cached(uploaded_files)
 
         # ── Validação única: deve haver ao menos um arquivo ──────────────── #
         if len(pdfs) > 1:
@@ -661,29 +465,47 @@ with col_result:
         tem_crm      = bool(imagens)
         tem_contrato = bool(pdfs)
 
-        # ── Salva arquivos temporários ───────────────────────────────────── #
-        with tempfile.TemporaryDirectory() as tmpdir:
-
+        # ── Staging persistente por sessão ───────────────────────────────── #
+        # Reutiliza o mesmo diretório entre cliques em Validar — cria/destruir
+        # um TemporaryDirectory a cada execução paga mkdir/rmdir por re-run.
+        # Em Linux /tmp é tmpfs, então as gravações ficam em memória.
+        tmpdir = st.session_state.get("_staging")
+        if tmpdir is None or not os.path.isdir(tmpdir):
+            tmpdir = tempfile.mkdtemp(prefix="crm_")
+            st.session_state._staging = tmpdir
+            atexit.register(shutil.rmtree, tmpdir, ignore_errors=True)
+
+        # Limpa restos da validação anterior antes de gravar os novos uploads.
+        for entrada in os.scandir(tmpdir):
+            os.unlink(entrada.path)
+
+        # Gravação em paralelo: o GIL é liberado durante os syscalls de
+        # escrita, então threads sobrepõem o I/O de vários uploads grandes.
+        def _salvar_em(uf) -> str:
+            destino = os.path.join(tmpdir, uf.name)
+            _salvar_upload(uf, destino)
+            return destino
+
+        if imagens:
+            with ThreadPoolExecutor(max_workers=min(8, len(imagens))) as pool:
+                caminhos_imagens = list(pool.map(_salvar_em, imagens))
+        else:
             caminhos_imagens = []
-            for uf in imagens:
-                destino = os.path.join(tmpdir, uf.name)
-                with open(destino, "wb") as f:
-                    f.write(uf.getbuffer())
-                caminhos_imagens.append(destino)
-
-            if tem_contrato:
-                caminho_pdf = os.path.join(tmpdir, pdfs[0].name)
-                with open(caminho_pdf, "wb") as f:
-                    f.write(pdfs[0].getbuffer())
-
-            saida_crm      = None
-            saida_contrato = None
-
-            # ── Pipeline CRM (imagens) ───────────────────────────────────── #
-            if tem_crm:
-                with st.spinner("Processando CRM..."):
+
+        saida_crm      = None
+        saida_contrato = None
+
+        # ── Pipelines CRM e Contrato em paralelo ─────────────────────── #
+        # Ambos são limitados por I/O (chamadas à API da Anthropic), então
+        # o tempo de parede cai para max(t_crm, t_contrato).
+        with st.spinner("Processando CRM e contrato..."):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                future_crm      = executor.submit(executar_pipeline, caminhos_imagens) if tem_crm else None
+                future_contrato = executor.submit(_executar_contrato, pdfs[0].getvalue()) if tem_contrato else None
+
+                if future_crm is not None:
                     try:
-                        saida_crm = executar_pipeline(caminhos_imagens)
+                        saida_crm = future_crm.result()
                     except ValueError as e:
                         _render_erro_inline("Erro no pipeline CRM", str(e))
                         st.stop()
@@ -691,17 +513,9 @@ with col_result:
                         _render_erro_inline("Falha no pipeline CRM", str(e))
                         st.stop()
 
-            # ── Pipeline Contrato (PDF) ──────────────────────────────────── #
-            if tem_contrato:
-                with st.spinner("Processando contrato..."):
+                if future_contrato is not None:
                     try:
-                        texto_contrato = extract_text_pdf(caminho_pdf)
-                        if not texto_contrato or not texto_contrato.strip():
-                            raise ValueError("O PDF do contrato não contém texto legível.")
-                        saida_contrato = executar_pipeline_contrato(
-                            texto_contrato = texto_contrato,
-                            dados_crm      = saida_crm.get("dados", {}) if saida_crm else None,
-                        )
+                        saida_contrato = future_contrato.result()
                     except ValueError as e:
                         _render_erro_inline("Erro no pipeline Contrato", str(e))
                         st.stop()
@@ -712,73 +526,70 @@ with col_result:
                         _render_erro_inline("Falha no pipeline Contrato", str(e))
                         st.stop()
 
-            # ── Consolidação ─────────────────────────────────────────────── #
-            status_crm      = saida_crm["resultado"]["status"] if saida_crm else None
-            status_contrato = saida_contrato["status_final"]   if saida_contrato else None
-            status_geral    = _status_geral(status_crm, status_contrato)
-
-            # ── Banner de status geral ───────────────────────────────────── #
-            _render_banner_status(status_geral)
-
-            # ── Arquivos processados ─────────────────────────────────────── #
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            st.markdown('<div class="card-title">📂 &nbsp;Arquivos processados</div>', unsafe_allow_html=True)
-            if saida_crm:
-                _render_arquivos(saida_crm["sucessos"], saida_crm["falhas"])
-            if tem_contrato:
-                st.markdown(f'<span class="file-tag">📑 {pdfs[0].name}</span>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            # ── Texto CRM consolidado (só se CRM foi executado) ──────────── #
-            if saida_crm:
-                with st.expander("🔍  Ver texto extraído do CRM", expanded=False):
-                    st.markdown(
-                        f'<div class="text-preview">{saida_crm["texto"][:1200]}'
-                        f'{"…" if len(saida_crm["texto"]) > 1200 else ""}</div>',
-                        unsafe_allow_html=True,
-                    )
-
-            # ── Dados CRM + Validação CRM (só se CRM foi executado) ──────── #
-            if saida_crm:
-                c1, c2 = st.columns([1.3, 1])
-
-                with c1:
-                    st.markdown('<div class="card">', unsafe_allow_html=True)
-                    st.markdown('<div class="card-title">🗂 &nbsp;Dados CRM extraídos</div>', unsafe_allow_html=True)
-                    _render_dados(saida_crm["dados"])
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-                with c2:
-                    st.markdown('<div class="card">', unsafe_allow_html=True)
-                    st.markdown('<div class="card-title">✅ &nbsp;Validação CRM</div>', unsafe_allow_html=True)
-                    _render_resultado(saida_crm["resultado"])
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-            # ── Card Contrato (só se contrato foi executado) ─────────────── #
-            if saida_contrato:
-                st.markdown('<div class="card">', unsafe_allow_html=True)
-                st.markdown('<div class="card-title">📜 &nbsp;Validação do Contrato</div>', unsafe_allow_html=True)
-                _render_contrato(saida_contrato)
-                st.markdown('</div>', unsafe_allow_html=True)
+        # ── Comparação CRM × Contrato (após os dois pipelines) ───────── #
+        if saida_crm and saida_contrato:
+            warns_cruzados = comparar_crm_contrato(
+                dados_crm      = saida_crm.get("dados", {}),
+                dados_contrato = saida_contrato["dados_extraidos"],
+            )
+            if warns_cruzados:
+                saida_contrato["warnings_crm_contrato"] = warns_cruzados
+                if saida_contrato["status_final"] == "valido":
+                    saida_contrato["status_final"] = "revisao_manual"
+
+        # ── Consolidação ─────────────────────────────────────────────── #
+        status_crm      = saida_crm["resultado"]["status"] if saida_crm else None
+        status_contrato = saida_contrato["status_final"]   if saida_contrato else None
+        status_geral    = _status_geral(status_crm, status_contrato)
+
+        # ── Banner de status geral ───────────────────────────────────── #
+        _render_banner_status(status_geral)
+
+        # ── Arquivos processados ─────────────────────────────────────── #
+        # Cada card é um único st.html — abrir/fechar o <div> em chamadas
+        # separadas custava um frame de websocket por fragmento.
+        partes_arquivos = ['<div class="card"><div class="card-title">📂 &nbsp;Arquivos processados</div>']
+        if saida_crm:
+            partes_arquivos.append(_html_arquivos(saida_crm["sucessos"], saida_crm["falhas"]))
+        if tem_contrato:
+            partes_arquivos.append(f'<span class="file-tag">📑 {_esc(pdfs[0].name)}</span>')
+        partes_arquivos.append('</div>')
+        st.html("".join(partes_arquivos))
+
+        # ── Texto CRM consolidado (só se CRM foi executado) ──────────── #
+        if saida_crm:
+            # Fatiamento + escape refeitos a cada rerun: 1200 caracteres são
+            # baratos, e memoizar por id(saida_crm) reutilizava chaves de
+            # objetos já coletados — podendo exibir o preview de outro documento.
+            texto_crm = saida_crm["texto"]
+            sufixo    = "…" if len(texto_crm) > 1200 else ""
+            with st.expander("🔍  Ver texto extraído do CRM", expanded=False):
+                st.html(
+                    f'<div class="text-preview">{_esc(texto_crm[:1200])}{sufixo}</div>'
+                )
+
+        # ── Dados CRM + Validação CRM (só se CRM foi executado) ──────── #
+        if saida_crm:
+            c1, c2 = st.columns([1.3, 1])
+
+            with c1:
+                st.html(
+                    '<div class="card"><div class="card-title">🗂 &nbsp;Dados CRM extraídos</div>'
+                    f'{_html_dados(saida_crm["dados"])}</div>'
+                )
+
+            with c2:
+                st.html(
+                    '<div class="card"><div class="card-title">✅ &nbsp;Validação CRM</div>'
+                    f'{_html_resultado(saida_crm["resultado"])}</div>'
+                )
+
+        # ── Card Contrato (só se contrato foi executado) ─────────────── #
+        if saida_contrato:
+            st.html(
+                '<div class="card"><div class="card-title">📜 &nbsp;Validação do Contrato</div>'
+                f'{_html_contrato(saida_contrato)}</div>'
+            )
 
     elif not uploaded_files:
-        st.markdown("""
-        <div style="
-            display:flex;
-            flex-direction:column;
-            align-items:center;
-            justify-content:center;
-            height:320px;
-            color:rgba(240,238,255,0.15);
-            text-align:center;
-            gap:0.75rem;
-        ">
-            <div style="font-size:2.5rem">📂</div>
-            <div style="font-family:'Syne',sans-serif;font-size:0.85rem;letter-spacing:0.08em">
-                NENHUM ARQUIVO ENVIADO
-            </div>
-            <div style="font-size:0.72rem;max-width:240px;line-height:1.6">
-                Envie as imagens do CRM e o PDF do contrato para iniciar a validação
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_vazio_html())
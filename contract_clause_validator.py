@@ -6,11 +6,29 @@ recebido com o modelo oficial correspondente.
 Dependências: apenas biblioteca padrão do Python (difflib, re, pathlib).
 """
 
+import functools
+import mmap
+import os
 import re
 import difflib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+# RapidFuzz (C++) é ordens de magnitude mais rápido que o SequenceMatcher
+# puro-Python do difflib no cálculo de similaridade por cláusula. O difflib
+# permanece como fallback quando o pacote não está instalado.
+try:
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _fuzz = None
+    _rf_process = None
+
+# cpdist (rapidfuzz >= 3.9) compara pares elemento a elemento em um pool de
+# threads C que libera o GIL — útil quando o contrato tem dezenas de cláusulas.
+_cpdist = getattr(_rf_process, "cpdist", None)
+
 
 # --------------------------------------------------------------------------- #
 # Configuração                                                                 #
@@ -23,12 +41,31 @@ ARQUIVOS_BASE: dict[str, str] = {
 
 SIMILARIDADE_MINIMA: float = 0.97
 
+# Limiar equivalente na escala inteira 0–100 do RapidFuzz — comparar ints
+# evita as divisões de float por cláusula no caminho quente.
+_CUTOFF: int = round(SIMILARIDADE_MINIMA * 100)
+
 PALAVRAS_CRITICAS: set[str] = {
     "multa", "prazo", "rescisão", "rescisao", "reajuste",
 }
 
+# Alternation compilada das palavras críticas: detecta qualquer uma delas em
+# uma única varredura C sobre o texto, no lugar de uma busca substring por
+# palavra a cada cláusula alterada.
+_RE_PALAVRAS_CRITICAS = re.compile(
+    "|".join(re.escape(palavra) for palavra in sorted(PALAVRAS_CRITICAS))
+)
+
+# Engine de regex: o módulo `regex` (quando instalado) tokeniza contratos
+# longos sem o re-backtracking do engine NFA da stdlib; a API é idêntica,
+# então o restante do módulo não muda.
+try:
+    import regex as _re_engine
+except ImportError:
+    _re_engine = re
+
 # Padrão de cláusula: "1.", "1.1", "1.1.2", "III.", "IV.", "A.", etc.
-PADRAO_CLAUSULA = re.compile(
+PADRAO_CLAUSULA = _re_engine.compile(
     r"(?:^|\n)"                          # início de linha
     r"("
     r"(?:[IVXLCDM]+\.)"                  # romano: III., IV.
@@ -36,7 +73,9 @@ PADRAO_CLAUSULA = re.compile(
     r"|(?:\d+(?:\.\d+)*\.?)"             # numérico: 1. | 1.1 | 1.1.2
     r")"
     r"\s",                               # seguido de espaço
-    re.MULTILINE,
+    # ASCII: os marcadores são todos ASCII, então \d e \s podem usar as
+    # tabelas de bytes do engine em vez de consultas Unicode por caractere.
+    _re_engine.MULTILINE | _re_engine.ASCII,
 )
 
 
@@ -66,41 +105,62 @@ def separar_clausulas(texto: str) -> dict[str, str]:
     Retorna:
         dict {marcador: conteudo_normalizado}
     """
-    matches = list(PADRAO_CLAUSULA.finditer(texto))
-    clausulas: dict[str, str] = {}
+    limites = [
+        (match.group(1).rstrip("."), match.end(), match.start())
+        for match in PADRAO_CLAUSULA.finditer(texto)
+    ]
 
-    for i, match in enumerate(matches):
-        marcador = match.group(1).rstrip(".")
-        inicio   = match.end()
-        fim      = matches[i + 1].start() if i + 1 < len(matches) else len(texto)
-        conteudo = texto[inicio:fim]
-        clausulas[marcador] = normalizar_texto(conteudo)
+    clausulas: dict[str, str] = {}
+    for (marcador, inicio, _), (_, _, fim) in zip(
+        limites, limites[1:] + [("", 0, len(texto))]
+    ):
+        # " ".join(split()) em texto minúsculo equivale a normalizar_texto
+        # (colapso de espaços + strip) sem duas entradas no engine de regex
+        # por cláusula.
+        clausulas[marcador] = " ".join(texto[inicio:fim].lower().split())
 
     return clausulas
 
 
 def calcular_similaridade(texto_a: str, texto_b: str) -> float:
     """
-    Calcula a similaridade entre dois textos normalizados usando
-    difflib.SequenceMatcher.
+    Calcula a similaridade entre dois textos usando RapidFuzz quando
+    disponível (com fallback para difflib.SequenceMatcher).
 
     Retorna:
         float entre 0.0 (completamente diferente) e 1.0 (idêntico).
     """
-    return difflib.SequenceMatcher(
-        None,
-        normalizar_texto(texto_a),
-        normalizar_texto(texto_b),
-    ).ratio()
+    # Sem score_cutoff: a API pública devolve o valor real em toda a faixa;
+    # a saída antecipada fica restrita ao caminho quente do validador, onde
+    # só a comparação contra o limiar importa.
+    texto_a = normalizar_texto(texto_a)
+    texto_b = normalizar_texto(texto_b)
+    if _fuzz is not None:
+        return _fuzz.ratio(texto_a, texto_b) / 100.0
+    return difflib.SequenceMatcher(None, texto_a, texto_b).ratio()
+
+
+def _similaridade_normalizada(texto_a: str, texto_b: str) -> float:
+    """
+    Similaridade entre textos já normalizados — caminho quente do validador.
+
+    Com RapidFuzz, score_cutoff permite que a comparação saia cedo assim que
+    o limite inferior bit-paralelo provar que a similaridade não alcança
+    SIMILARIDADE_MINIMA; o retorno 0.0 nesses casos preserva o resultado da
+    comparação contra o limiar.
+    """
+    if _fuzz is not None:
+        return _fuzz.ratio(texto_a, texto_b, score_cutoff=_CUTOFF) / 100.0
+    return difflib.SequenceMatcher(None, texto_a, texto_b).ratio()
 
 
 # --------------------------------------------------------------------------- #
 # Helpers internos                                                             #
 # --------------------------------------------------------------------------- #
 
-def _carregar_modelo_base(modelo: str, diretorio_base: Optional[str] = None) -> str:
+def _caminho_modelo_base(modelo: str, diretorio_base: Optional[str] = None) -> Path:
     """
-    Carrega o arquivo de modelo base correspondente ao tipo de contrato.
+    Resolve o caminho do arquivo de modelo base correspondente ao tipo de contrato.
 
     Parâmetros:
         modelo: "novo" ou "antigo_v13".
@@ -127,7 +187,45 @@ def _carregar_modelo_base(modelo: str, diretorio_base: Optional[str] = None) ->
             f"Certifique-se de que '{nome_arquivo}' está no diretório '{diretorio}'."
         )
 
-    return caminho.read_text(encoding="utf-8")
+    return caminho
+
+
+def _ler_modelo_base(caminho: Path) -> str:
+    """
+    Lê um arquivo de modelo base via mmap.
+
+    Decodifica direto do page cache do SO, sem o buffer bytes intermediário
+    que read_text() aloca — e, em deploys multi-worker, as páginas mapeadas
+    são compartilhadas entre processos.
+    """
+    with open(caminho, "rb") as arquivo:
+        # mmap rejeita arquivos vazios; modelo base vazio continua válido
+        # (todas as cláusulas serão reportadas como ausentes).
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapeado:
+            return mapeado[:].decode("utf-8")
+
+
+def _carregar_modelo_base(modelo: str, diretorio_base: Optional[str] = None) -> str:
+    """Carrega o conteúdo do arquivo de modelo base (ver _caminho_modelo_base)."""
+    return _ler_modelo_base(_caminho_modelo_base(modelo, diretorio_base))
+
+
+@functools.lru_cache(maxsize=8)
+def _clausulas_base_cached(
+    caminho: Path,
+    _mtime:  float,
+) -> tuple[dict[str, str], frozenset]:
+    """
+    Separa e normaliza as cláusulas de um modelo base, com cache por arquivo.
+
+    Os modelos base são estáticos; reler e renormalizar cada cláusula a cada
+    validação é trabalho repetido. O mtime participa da chave para invalidar
+    o cache se o arquivo base for atualizado em disco.
+    """
+    clausulas = separar_clausulas(_ler_modelo_base(caminho))
+    return clausulas, frozenset(clausulas)
 
 
 def _determinar_nivel_risco(
@@ -156,9 +254,11 @@ def _determinar_nivel_risco(
     for marcador in clausulas_alteradas:
         conteudo_base     = clausulas_base.get(marcador, "")
         conteudo_contrato = clausulas_contrato.get(marcador, "")
-        texto_combinado   = f"{conteudo_base} {conteudo_contrato}".lower()
+        # Conteúdos já estão em minúsculas (separar_clausulas normaliza) —
+        # nada de .lower() extra sobre o texto combinado.
+        texto_combinado   = f"{conteudo_base} {conteudo_contrato}"
 
-        if any(palavra in texto_combinado for palavra in PALAVRAS_CRITICAS):
+        if _RE_PALAVRAS_CRITICAS.search(texto_combinado):
             return "alto"
 
     if clausulas_alteradas:
@@ -200,34 +300,63 @@ def validar_clausulas(
         ValueError: Se o modelo não for reconhecido.
         FileNotFoundError: Se o arquivo de modelo base não for encontrado.
     """
-    # 1. Carrega e separa cláusulas do modelo base
-    texto_base          = _carregar_modelo_base(modelo, diretorio_base)
-    clausulas_base      = separar_clausulas(texto_base)
-    clausulas_contrato  = separar_clausulas(texto_contrato)
-
-    clausulas_alteradas: list[str] = []
-    clausulas_ausentes:  list[str] = []
-    clausulas_extras:    list[str] = []
-
-    # 2. Compara cada cláusula da base com o contrato recebido
-    for marcador, conteudo_base in clausulas_base.items():
-        if marcador not in clausulas_contrato:
-            clausulas_ausentes.append(marcador)
-            continue
-
-        similaridade = calcular_similaridade(
-            conteudo_base,
-            clausulas_contrato[marcador],
+    # 1. Carrega e separa cláusulas do modelo base (cacheado por mtime)
+    caminho_base = _caminho_modelo_base(modelo, diretorio_base)
+    clausulas_base, marcadores_base = _clausulas_base_cached(
+        caminho_base, caminho_base.stat().st_mtime
+    )
+    clausulas_contrato = separar_clausulas(texto_contrato)
+
+    # 2. Ausentes e extras via álgebra de conjuntos das views de dict — a
+    #    diferença roda no hashset em C; as comprehensions só preservam a
+    #    ordem do documento correspondente nas listas de saída.
+    ausentes = clausulas_base.keys() - clausulas_contrato.keys()
+    extras   = clausulas_contrato.keys() - marcadores_base
+
+    clausulas_ausentes = [m for m in clausulas_base     if m in ausentes]
+    clausulas_extras   = [m for m in clausulas_contrato if m in extras]
+
+    # 3. Similaridade apenas nos marcadores presentes em ambos os textos.
+    #    Conteúdos já saem normalizados de separar_clausulas — não repete a
+    #    normalização por comparação.
+    marcadores_comuns = [m for m in clausulas_base if m not in ausentes]
+
+    # Pré-filtro por comprimento: o ratio é limitado por 2·min(la,lb)/(la+lb),
+    # então pares cuja cota nem alcança o limiar já podem ser marcados como
+    # alterados em O(1), sem rodar o matcher.
+    alteradas_set: set[str] = set()
+    pares_restantes: list[tuple[str, str, str]] = []
+    for marcador in marcadores_comuns:
+        a = clausulas_base[marcador]
+        b = clausulas_contrato[marcador]
+        if 2 * min(len(a), len(b)) < SIMILARIDADE_MINIMA * (len(a) + len(b)):
+            alteradas_set.add(marcador)
+        else:
+            pares_restantes.append((marcador, a, b))
+
+    if _cpdist is not None and pares_restantes:
+        # Lote único: todos os pares são comparados de uma vez, em paralelo,
+        # fora do interpretador.
+        scores = _cpdist(
+            [a for _, a, _ in pares_restantes],
+            [b for _, _, b in pares_restantes],
+            scorer=_fuzz.ratio,
+            workers=-1,
+        )
+        alteradas_set.update(
+            marcador
+            for (marcador, _, _), score in zip(pares_restantes, scores)
+            if score < _CUTOFF
+        )
+    else:
+        alteradas_set.update(
+            marcador
+            for marcador, a, b in pares_restantes
+            if _similaridade_normalizada(a, b) < SIMILARIDADE_MINIMA
         )
 
-        if similaridade < SIMILARIDADE_MINIMA:
-            clausulas_alteradas.append(marcador)
-
-    # 3. Detecta cláusulas extras (presentes no contrato mas ausentes na base)
-    marcadores_base = set(clausulas_base.keys())
-    for marcador in clausulas_contrato:
-        if marcador not in marcadores_base:
-            clausulas_extras.append(marcador)
+    # Preserva a ordem do documento na lista de saída
+    clausulas_alteradas = [m for m in marcadores_comuns if m in alteradas_set]
 
     # 4. Determina nível de risco
     nivel_risco = _determinar_nivel_risco(
@@ -250,13 +379,66 @@ def validar_clausulas(
     }
 
 
+# --------------------------------------------------------------------------- #
+# Validação em lote                                                            #
+# --------------------------------------------------------------------------- #
+
+def _validar_item(item: tuple[str, str], diretorio_base: Optional[str]) -> dict:
+    """Valida um par (modelo, texto) — alvo picklável dos workers do lote."""
+    modelo, texto_contrato = item
+    return validar_clausulas(modelo, texto_contrato, diretorio_base)
+
+
+def validar_clausulas_lote(
+    itens:          list[tuple[str, str]],
+    diretorio_base: Optional[str] = None,
+    n_procs:        Optional[int] = None,
+) -> list[dict]:
+    """
+    Valida as cláusulas de vários contratos em processos paralelos.
+
+    A validação é limitada por CPU (tokenização, similaridade, diffs) e não
+    libera o GIL no fallback puro-Python — threads não escalam aqui. Um pool
+    de processos distribui os contratos entre os núcleos; cada worker monta
+    seu próprio cache de cláusulas base na primeira validação e o reaproveita
+    nas seguintes.
+
+    Parâmetros:
+        itens (list[tuple[str, str]]): Pares (modelo, texto_contrato), um por
+            contrato, na ordem desejada para os resultados.
+        diretorio_base (str, opcional): Diretório dos arquivos de modelo base,
+            compartilhado por todos os itens.
+        n_procs (int, opcional): Número de processos. Se None, usa os núcleos
+            disponíveis.
+
+    Retorna:
+        list[dict]: Resultados de validar_clausulas, na mesma ordem de entrada.
+
+    Lança:
+        ValueError / FileNotFoundError: Propagadas de validar_clausulas.
+    """
+    if not itens:
+        return []
+
+    # Um único contrato não amortiza o custo de subir um pool de processos
+    if len(itens) == 1:
+        modelo, texto_contrato = itens[0]
+        return [validar_clausulas(modelo, texto_contrato, diretorio_base)]
+
+    alvo = functools.partial(_validar_item, diretorio_base=diretorio_base)
+
+    with ProcessPoolExecutor(
+        max_workers=min(n_procs or os.cpu_count() or 1, len(itens))
+    ) as pool:
+        return list(pool.map(alvo, itens))
+
+
 # --------------------------------------------------------------------------- #
 # Exemplo de uso                                                               #
 # --------------------------------------------------------------------------- #
 
 if __name__ == "__main__":
     import tempfile
-    import os
 
     # Modelo base simulado
     MODELO_BASE = """\
@@ -6,66 +6,17 @@ Não utiliza IA — apenas regras e lógica de negócio.
 
 from typing import Optional
 
+from contract_schema import CAMPOS_NUMERICOS
+
 
 # --------------------------------------------------------------------------- #
 # Configuração de campos por modelo                                            #
 # --------------------------------------------------------------------------- #
 
-# "comercial" é o modo genérico usado pelo pipeline quando não há detecção de template.
-# Utiliza o mesmo conjunto de campos obrigatórios que "novo".
-CAMPOS_OBRIGATORIOS: dict[str, list[str]] = {
-    "novo": [
-        "nome_escola",
-        "razao_social",
-        "cnpj",
-        "email_login",
-        "email_financeiro",
-        "whatsapp",
-        "alunos_totais",
-        "alunos_gamificados",
-        "implantacao",
-        "assinatura",
-        "inicio_implantacao",
-        "inicio_cobranca",
-        "cards_enviados",
-    ],
-    "antigo_v13": [
-        "nome_escola",
-        "razao_social",
-        "cnpj",
-        "email_login",
-        "email_financeiro",
-        "whatsapp",
-        "alunos_totais",
-        "alunos_gamificados",
-        "implantacao",
-        "assinatura",
-        "inicio_implantacao",
-        "inicio_cobranca",
-        "cards_enviados",
-    ],
-    "comercial": [
-        "nome_escola",
-        "razao_social",
-        "cnpj",
-        "email_login",
-        "email_financeiro",
-        "whatsapp",
-        "alunos_totais",
-        "alunos_gamificados",
-        "implantacao",
-        "assinatura",
-        "inicio_implantacao",
-        "inicio_cobranca",
-        "cards_enviados",
-    ],
-}
-
-CAMPOS_NUMERICOS = {"alunos_totais", "alunos_gamificados", "implantacao"}
-
-# Lista fixa de campos obrigatórios para validação comercial.
-# Independente de modelo ou template de contrato.
-CAMPOS_COMERCIAIS: list[str] = [
+# Os três modelos exigem exatamente os mesmos campos — uma única tupla
+# imutável compartilhada serve a todas as chaves, em vez de três listas
+# idênticas alocadas separadamente.
+_OBRIGATORIOS_COMUNS: tuple[str, ...] = (
     "nome_escola",
     "razao_social",
     "cnpj",
@@ -79,13 +30,44 @@ CAMPOS_COMERCIAIS: list[str] = [
     "inicio_implantacao",
     "inicio_cobranca",
     "cards_enviados",
-]
+)
+
+# "comercial" é o modo genérico usado pelo pipeline quando não há detecção de template.
+# Utiliza o mesmo conjunto de campos obrigatórios que "novo".
+CAMPOS_OBRIGATORIOS: dict[str, tuple[str, ...]] = {
+    "novo":       _OBRIGATORIOS_COMUNS,
+    "antigo_v13": _OBRIGATORIOS_COMUNS,
+    "comercial":  _OBRIGATORIOS_COMUNS,
+}
+
+# CAMPOS_NUMERICOS: conjunto canônico importado de contract_schema,
+# compartilhado com contract_parser.
+
+# Campos obrigatórios para validação comercial — mesmo conjunto compartilhado,
+# independente de modelo ou template de contrato.
+CAMPOS_COMERCIAIS: tuple[str, ...] = _OBRIGATORIOS_COMUNS
 
 PLACEHOLDERS = {"{{", "}}", "____", "xxxxx"}
 
+# Tupla minúscula ordenada por probabilidade de ocorrência: os valores de
+# campo são curtos (<200 chars), e para agulhas tão pequenas o str.find em C
+# de `in` vence a máquina de estados de um regex — com o any() parando na
+# primeira ocorrência.
+PLACEHOLDERS_LOWER: tuple[str, ...] = ("{{", "}}", "____", "xxxxx")
+
 LIMIAR_ALUNOS_BAIXO  = 5
 LIMIAR_IMPLANTACAO_ZERO = 0
 
+# Classificação por campo pré-computada no import: permite fundir as passadas
+# de presença/placeholder e de regras numéricas em um único loop, com uma
+# única busca no dict por campo.
+_KIND_STRING  = 1
+_KIND_NUMERIC = 2
+_FIELD_KIND: dict[str, int] = {
+    campo: (_KIND_NUMERIC if campo in CAMPOS_NUMERICOS else _KIND_STRING)
+    for campo in _OBRIGATORIOS_COMUNS
+}
+
 
 # --------------------------------------------------------------------------- #
 # Helpers internos                                                             #
@@ -102,74 +84,84 @@ def _e_vazio(valor) -> bool:
 
 def _contem_placeholder(valor) -> bool:
     """Retorna True se o valor contiver algum dos placeholders conhecidos."""
-    if not isinstance(valor, str):
-        return False
+    if not isinstance(valor, str) or len(valor) < 2:
+        return False  # Nenhum placeholder cabe em menos de 2 caracteres
     valor_lower = valor.lower()
-    return any(ph.lower() in valor_lower for ph in PLACEHOLDERS)
+    return any(ph in valor_lower for ph in PLACEHOLDERS_LOWER)
 
 
-def _validar_presenca(
-    dados: dict,
-    campos_obrigatorios: list[str],
-    erros: list[str],
-) -> None:
-    """Verifica campos obrigatórios: ausência, vazio, espaços e placeholders."""
-    for campo in campos_obrigatorios:
-        valor = dados.get(campo)
+def _coerce_num(campo: str, valor, erros: list[str]) -> Optional[float]:
+    """
+    Valida e converte um campo numérico individual.
 
-        if _e_vazio(valor):
-            erros.append(
-                f"Campo obrigatório ausente ou vazio: '{campo}'."
-            )
-            continue  # Não verifica placeholder em campo já vazio
+    Retorna o valor como float, ou None quando o campo está ausente, tem tipo
+    inválido ou é negativo — casos excluídos das comparações subsequentes.
+    """
+    if valor is None:
+        return None
+
+    if not isinstance(valor, (int, float)):
+        # Tipo inválido já deveria ser capturado pelo contract_parser,
+        # mas validamos defensivamente.
+        erros.append(
+            f"Campo '{campo}' deveria ser numérico, mas recebeu "
+            f"{type(valor).__name__}: {valor!r}."
+        )
+        return None
 
-        if _contem_placeholder(valor):
-            erros.append(
-                f"Campo '{campo}' contém placeholder inválido: {valor!r}."
-            )
+    if valor < 0:
+        erros.append(
+            f"Campo '{campo}' não pode ser negativo (recebido: {valor})."
+        )
+        return None
 
+    return float(valor)
 
-def _validar_numericos(
+
+def _validar_campos(
     dados: dict,
+    campos_obrigatorios: tuple[str, ...],
     erros: list[str],
     warnings: list[str],
 ) -> None:
     """
-    Valida campos numéricos:
-    - Negativos → erro crítico
+    Passada única sobre os campos obrigatórios, fundindo as verificações:
+    - Ausência, vazio ou só espaços → erro crítico
+    - Placeholder em campo textual → erro crítico
+    - Negativos / tipo inválido em campo numérico → erro crítico
     - alunos_gamificados > alunos_totais → erro crítico
     - alunos_totais <= LIMIAR_ALUNOS_BAIXO → warning
     - implantacao == 0 → warning
+
+    O dispatch por _FIELD_KIND faz uma única busca no dict por campo, no
+    lugar das passadas separadas de presença e de regras numéricas.
     """
-    valores: dict[str, Optional[float]] = {}
+    numericos: dict[str, Optional[float]] = {}
 
-    for campo in CAMPOS_NUMERICOS:
+    for campo in campos_obrigatorios:
         valor = dados.get(campo)
-        if valor is None:
-            valores[campo] = None
-            continue
-        if not isinstance(valor, (int, float)):
-            # Tipo inválido já deveria ser capturado pelo contract_parser,
-            # mas validamos defensivamente.
+        kind  = _FIELD_KIND[campo]
+
+        if _e_vazio(valor):
             erros.append(
-                f"Campo '{campo}' deveria ser numérico, mas recebeu "
-                f"{type(valor).__name__}: {valor!r}."
+                f"Campo obrigatório ausente ou vazio: '{campo}'."
             )
-            valores[campo] = None
-            continue
+            if kind == _KIND_NUMERIC:
+                numericos[campo] = None
+            continue  # Não verifica as demais regras em campo já vazio
 
-        if valor < 0:
+        if kind == _KIND_NUMERIC:
+            numericos[campo] = _coerce_num(campo, valor, erros)
+        elif _contem_placeholder(valor):
             erros.append(
-                f"Campo '{campo}' não pode ser negativo (recebido: {valor})."
+                f"Campo '{campo}' contém placeholder inválido: {valor!r}."
             )
-            valores[campo] = None  # Exclui do uso em comparações subsequentes
-        else:
-            valores[campo] = float(valor)
 
-    # Comparação alunos_gamificados × alunos_totais
-    gamificados = valores.get("alunos_gamificados")
-    totais      = valores.get("alunos_totais")
+    totais      = numericos.get("alunos_totais")
+    gamificados = numericos.get("alunos_gamificados")
+    implantacao = numericos.get("implantacao")
 
+    # Comparação alunos_gamificados × alunos_totais
     if gamificados is not None and totais is not None:
         if gamificados > totais:
             erros.append(
@@ -184,7 +176,6 @@ def _validar_numericos(
             "Verifique se o valor está correto."
         )
 
-    implantacao = valores.get("implantacao")
     if implantacao is not None and implantacao == LIMIAR_IMPLANTACAO_ZERO:
         warnings.append(
             "'implantacao' está zerada. "
@@ -218,27 +209,47 @@ def validar_campos_contrato(resultado_parser: dict) -> dict:
     Lança:
         ValueError: Se "dados" estiver ausente ou não for um dicionário.
     """
-    dados = resultado_parser.get("dados")
-
-    if not isinstance(dados, dict):
-        raise ValueError("Campo 'dados' ausente ou não é um dicionário.")
-
     erros:    list[str] = []
     warnings: list[str] = []
 
-    # 1. Presença, vazio, espaços e placeholders — campos comerciais fixos
-    _validar_presenca(dados, CAMPOS_COMERCIAIS, erros)
-
-    # 2. Regras numéricas e comparações
-    _validar_numericos(dados, erros, warnings)
+    valido = _validar_campos_contrato_into(
+        resultado_parser, erros=erros, warnings=warnings
+    )
 
     return {
-        "valido":          len(erros) == 0,
+        "valido":          valido,
         "erros_criticos":  erros,
         "warnings":        warnings,
     }
 
 
+def _validar_campos_contrato_into(
+    resultado_parser: dict,
+    *,
+    erros: list[str],
+    warnings: list[str],
+) -> bool:
+    """
+    Variante de validar_campos_contrato para uso em lote: preenche buffers
+    fornecidos (e previamente limpos) pelo chamador e retorna só o veredito.
+
+    Evita alocar duas listas e um dict de resultado por contrato quando
+    muitos contratos são validados em sequência.
+
+    Lança:
+        ValueError: Se "dados" estiver ausente ou não for um dicionário.
+    """
+    dados = resultado_parser.get("dados")
+
+    if not isinstance(dados, dict):
+        raise ValueError("Campo 'dados' ausente ou não é um dicionário.")
+
+    # Presença, placeholders e regras numéricas em uma única passada
+    _validar_campos(dados, CAMPOS_COMERCIAIS, erros, warnings)
+
+    return len(erros) == 0
+
+
 # --------------------------------------------------------------------------- #
 # Exemplos de uso                                                              #
 # --------------------------------------------------------------------------- #
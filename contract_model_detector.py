@@ -4,6 +4,7 @@ Detecção automática do modelo de contrato com base em marcadores textuais.
 Não utiliza IA — apenas lógica de busca por strings com regras definidas.
 """
 
+import re
 from typing import Optional
 
 
@@ -22,6 +23,23 @@ MARCADORES: dict[str, list[str]] = {
     ],
 }
 
+# Índice marcador minúsculo → (modelo, marcador original) e alternation
+# compilada de todos os marcadores: o texto inteiro é varrido uma única vez
+# pelo engine de regex em C, no lugar de uma busca substring por marcador.
+# Para este volume de padrões um automaton multi-padrão dedicado não
+# compensaria a dependência extra.
+_MARCADOR_POR_LOWER: dict[str, tuple[str, str]] = {
+    marcador.lower(): (modelo, marcador)
+    for modelo, marcadores in MARCADORES.items()
+    for marcador in marcadores
+}
+_RE_MARCADORES = re.compile(
+    "|".join(
+        re.escape(marcador)
+        for marcador in sorted(_MARCADOR_POR_LOWER, key=len, reverse=True)
+    )
+)
+
 # Valores de confiança
 CONFIANCA_ENCONTRADO  = 0.95
 CONFIANCA_AMBIGUO     = 0.50
@@ -51,15 +69,16 @@ def detectar_modelo_contrato(texto: str) -> dict:
     texto_lower = texto.lower()
     encontrados_por_modelo: dict[str, list[str]] = {}
 
-    # Busca case-insensitive por cada marcador de cada modelo
-    for modelo, marcadores in MARCADORES.items():
-        achados = [
-            marcador
-            for marcador in marcadores
-            if marcador.lower() in texto_lower
-        ]
-        if achados:
-            encontrados_por_modelo[modelo] = achados
+    # Busca case-insensitive: uma única passada da alternation compilada
+    # sobre o texto; ocorrências repetidas do mesmo marcador são ignoradas.
+    vistos: set[str] = set()
+    for m in _RE_MARCADORES.finditer(texto_lower):
+        achado = m.group()
+        if achado in vistos:
+            continue
+        vistos.add(achado)
+        modelo_achado, marcador_original = _MARCADOR_POR_LOWER[achado]
+        encontrados_por_modelo.setdefault(modelo_achado, []).append(marcador_original)
 
     marcadores_encontrados: list[str] = [
         marcador
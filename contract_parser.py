@@ -7,10 +7,15 @@ texto bruto via OCR, utilizando a API da Anthropic (Claude).
 import json
 import os
 import re
+import sys
+import threading
+import time
 from typing import Optional
 
 import anthropic
 
+from contract_schema import CAMPOS_NUMERICOS
+
 
 
 # --------------------------------------------------------------------------- #
@@ -21,6 +26,10 @@ MODEL       = "claude-sonnet-4-6"
 MAX_TOKENS  = 2048
 TEMPERATURE = 0.0
 
+# Polling da Message Batches API (extração em lote)
+INTERVALO_POLLING_LOTE = 2.0   # segundos, dobra a cada tentativa
+INTERVALO_POLLING_MAX  = 60.0
+
 CAMPOS_DADOS = [
     "nome_escola",
     "razao_social",
@@ -40,6 +49,11 @@ CAMPOS_DADOS = [
     "ia",
 ]
 
+# Nomes de campo internados: junto com a internação das chaves vindas do
+# json.loads (ver extrair_dados_contrato), as buscas de dict na validação
+# resolvem por identidade de ponteiro em vez de comparação de string.
+CAMPOS_DADOS = [sys.intern(c) for c in CAMPOS_DADOS]
+
 SYSTEM_PROMPT = """\
 Você é um assistente especializado em extração de dados de contratos escolares.
 
@@ -81,6 +95,17 @@ Estrutura exigida:
 Não inclua o campo "modelo" — ele é gerenciado exclusivamente pelo backend.
 """
 
+# System prompt embalado com cache_control: a API reaproveita o prefixo
+# estático entre chamadas (prompt caching), cortando custo e latência dos
+# tokens de entrada — todo contrato usa exatamente o mesmo prompt.
+_SYSTEM_CACHEADO = [
+    {
+        "type": "text",
+        "text": SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
 
 # --------------------------------------------------------------------------- #
 # Helpers internos                                                             #
@@ -90,77 +115,93 @@ def _build_user_message(texto_bruto: str) -> str:
     return f"Extraia os dados do seguinte contrato:\n\n{texto_bruto}"
 
 
+# Cache de clientes por chave de API: cada anthropic.Anthropic embute um pool
+# de conexões httpx próprio; reconstruí-lo a cada contrato descarta o pool e
+# paga um novo handshake TLS por chamada.
+_CLIENT_CACHE: dict[Optional[str], anthropic.Anthropic] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client(api_key: Optional[str]) -> anthropic.Anthropic:
+    """Retorna o cliente Anthropic memoizado para a chave informada."""
+    key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+    cliente = _CLIENT_CACHE.get(key)
+    if cliente is None:
+        with _CLIENT_LOCK:
+            cliente = _CLIENT_CACHE.get(key)
+            if cliente is None:
+                cliente = _CLIENT_CACHE.setdefault(
+                    key, anthropic.Anthropic(api_key=key)
+                )
+    return cliente
+
+
+def fechar_clientes() -> None:
+    """
+    Fecha e descarta os clientes Anthropic memoizados.
+
+    Para shutdown gracioso de processos de longa duração: libera as conexões
+    keep-alive dos pools httpx embutidos. O próximo _get_client reconstrói o
+    cliente normalmente.
+    """
+    with _CLIENT_LOCK:
+        clientes = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+    for cliente in clientes:
+        cliente.close()
+
+
 def _parse_json_response(content: str) -> dict:
     """
     Extrai e interpreta o primeiro objeto JSON estruturalmente válido da resposta.
 
     Estratégia:
-        Em vez de regex simples (que não entende aninhamento), a função varre o
-        texto caractere a caractere rastreando a profundidade de chaves { }.
-        Isso garante que apenas um bloco completo e balanceado seja candidato ao
-        parsing — tolerando texto livre antes e depois do JSON, múltiplos blocos
-        na resposta, e objetos profundamente aninhados.
+        Delega a varredura ao scanner em C de json.JSONDecoder.raw_decode, que
+        já entende strings, escapes e aninhamento nativamente — tolerando texto
+        livre antes e depois do JSON e múltiplos blocos na resposta, sem a
+        máquina de estados caractere a caractere em Python puro que dominava o
+        custo em respostas longas.
 
     Fluxo:
-        1. Localiza o primeiro '{' no texto.
-        2. Avança rastreando abertura/fechamento de chaves (ignora chaves dentro
-           de strings para evitar falsos positivos).
-        3. Ao atingir profundidade 0 pela primeira vez, delimita o candidato.
-        4. Tenta json.loads() no candidato — se falhar, busca o próximo '{'.
-        5. Se nenhum candidato for parseável, lança ValueError detalhado.
+        1. Localiza o próximo '{' no texto.
+        2. Tenta raw_decode() a partir dessa posição — sucesso retorna o objeto.
+        3. Se falhar, repete a busca a partir do '{' seguinte.
+        4. Se nenhuma posição render um objeto, lança ValueError detalhado.
 
     Lança:
         ValueError: Se nenhum JSON válido for encontrado na resposta.
     """
-    candidatos_tentados: list[str] = []
+    # Caminho rápido: com o SYSTEM_PROMPT atual a resposta quase sempre é
+    # JSON puro — um json.loads direto evita o loop de candidatos inteiro.
+    stripped = content.strip()
+    if stripped[:1] == "{" and stripped[-1:] == "}":
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass  # Prossegue para a varredura tolerante a texto livre
+
+    decoder = json.JSONDecoder()
+    candidatos_tentados = 0
     pos = 0
 
-    while pos < len(content):
+    while True:
         inicio = content.find("{", pos)
         if inicio == -1:
             break
 
-        profundidade = 0
-        dentro_de_string = False
-        escape = False
-
-        for i, char in enumerate(content[inicio:], start=inicio):
-            if escape:
-                escape = False
-                continue
-            if char == "\\" and dentro_de_string:
-                escape = True
-                continue
-            if char == '"' and not escape:
-                dentro_de_string = not dentro_de_string
-                continue
-            if dentro_de_string:
-                continue
-            if char == "{":
-                profundidade += 1
-            elif char == "}":
-                profundidade -= 1
-                if profundidade == 0:
-                    candidato = content[inicio: i + 1]
-                    candidatos_tentados.append(candidato)
-                    try:
-                        return json.loads(candidato)
-                    except json.JSONDecodeError:
-                        # Bloco balanceado mas inválido; tenta a partir do próximo '{'
-                        pos = inicio + 1
-                        break
-            else:
-                continue
-        else:
-            # Chegou ao fim sem fechar todas as chaves — bloco incompleto
+        candidatos_tentados += 1
+        try:
+            objeto, _fim = decoder.raw_decode(content, inicio)
+            return objeto
+        except json.JSONDecodeError:
             pos = inicio + 1
 
     # Nenhum candidato parseável encontrado
     if candidatos_tentados:
         raise ValueError(
-            f"{len(candidatos_tentados)} bloco(s) JSON encontrado(s), mas nenhum é válido.\n"
-            f"Último candidato tentado:\n{candidatos_tentados[-1]}\n"
-            f"Verifique se a resposta do modelo está malformada."
+            f"{candidatos_tentados} candidato(s) a JSON encontrado(s), mas nenhum é válido.\n"
+            f"Verifique se a resposta do modelo está malformada.\n"
+            f"Conteúdo recebido:\n{content}"
         )
 
     raise ValueError(
@@ -169,16 +210,19 @@ def _parse_json_response(content: str) -> dict:
     )
 
 
+# Template com todos os campos a None, montado uma vez no import — o merge
+# {**template, **dados} roda em C e substitui um setdefault por campo em
+# loop Python. Bônus: a ordem dos campos na saída passa a seguir CAMPOS_DADOS.
+_DADOS_TEMPLATE: dict[str, None] = dict.fromkeys(CAMPOS_DADOS, None)
+
+
 def _garantir_campos(resultado: dict) -> dict:
     """
     Garante que o retorno contenha a estrutura completa esperada,
     preenchendo campos ausentes com None.
     """
-    resultado.setdefault("dados", {})
-
-    for campo in CAMPOS_DADOS:
-        resultado["dados"].setdefault(campo, None)
-
+    dados_recebidos = resultado.get("dados") or {}
+    resultado["dados"] = {**_DADOS_TEMPLATE, **dados_recebidos}
     return resultado
 
 
@@ -186,7 +230,27 @@ def _garantir_campos(resultado: dict) -> dict:
 # Validação estrutural                                                         #
 # --------------------------------------------------------------------------- #
 
-CAMPOS_NUMERICOS = {"implantacao", "alunos_totais", "alunos_gamificados"}
+# CAMPOS_NUMERICOS: conjunto canônico importado de contract_schema,
+# compartilhado com contract_fields_validator.
+
+# Versão congelada de CAMPOS_DADOS para a checagem de ausentes via diferença
+# de conjuntos em C, no lugar de uma comprehension sobre todos os campos.
+_CAMPOS_DADOS_FROZEN = frozenset(CAMPOS_DADOS)
+
+# Despacho por tipo exato: uma busca de dict com type(valor) substitui as
+# cadeias de isinstance por campo. json.loads só produz estes tipos exatos,
+# então a chave sempre acerta; o default cobre tipos estranhos como escalar.
+_ACAO_NUMERICO = 1
+_ACAO_ESCALAR  = 2
+_ACAO_COMPOSTO = 3
+_TYPE_ACTION: dict[type, int] = {
+    bool:  _ACAO_NUMERICO,  # bool é subclasse de int — mesmo veredito do isinstance
+    int:   _ACAO_NUMERICO,
+    float: _ACAO_NUMERICO,
+    str:   _ACAO_ESCALAR,
+    list:  _ACAO_COMPOSTO,
+    dict:  _ACAO_COMPOSTO,
+}
 
 
 def _validar_estrutura(resultado: dict) -> None:
@@ -218,11 +282,11 @@ def _validar_estrutura(resultado: dict) -> None:
             f"mas recebeu: {type(dados).__name__}."
         )
 
-    # 3. Todos os campos obrigatórios presentes
-    ausentes = [c for c in CAMPOS_DADOS if c not in dados]
+    # 3. Todos os campos obrigatórios presentes (sorted só no caminho de erro)
+    ausentes = _CAMPOS_DADOS_FROZEN - dados.keys()
     if ausentes:
         raise ValueError(
-            f"Campo(s) obrigatório(s) ausente(s) em \'dados\': {ausentes}."
+            f"Campo(s) obrigatório(s) ausente(s) em \'dados\': {sorted(ausentes)}."
         )
 
     # 4 + 5. Validação de tipo por campo
@@ -232,13 +296,15 @@ def _validar_estrutura(resultado: dict) -> None:
         if valor is None:
             continue  # None é sempre permitido
 
+        acao = _TYPE_ACTION.get(type(valor), _ACAO_ESCALAR)
+
         if campo in CAMPOS_NUMERICOS:
-            if not isinstance(valor, (int, float)):
+            if acao != _ACAO_NUMERICO:
                 erros_tipo.append(
                     f"\'{campo}\' deve ser numérico ou null, "
                     f"mas recebeu {type(valor).__name__}: {valor!r}."
                 )
-        elif isinstance(valor, (list, dict)):
+        elif acao == _ACAO_COMPOSTO:
             erros_tipo.append(
                 f"\'{campo}\' não pode ser {type(valor).__name__} — "
                 f"apenas string, número ou null são permitidos."
@@ -281,17 +347,15 @@ def extrair_dados_contrato(
     if not texto_bruto or not texto_bruto.strip():
         raise ValueError("O texto do contrato está vazio.")
 
-    # 1. Chamada à API
-    client = anthropic.Anthropic(
-        api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
-    )
+    # 1. Chamada à API (cliente memoizado — mantém o pool de conexões vivo)
+    client = _get_client(api_key)
 
     try:
         message = client.messages.create(
             model=MODEL,
             max_tokens=MAX_TOKENS,
             temperature=TEMPERATURE,
-            system=SYSTEM_PROMPT,
+            system=_SYSTEM_CACHEADO,
             messages=[
                 {
                     "role": "user",
@@ -302,17 +366,111 @@ def extrair_dados_contrato(
     except anthropic.APIError as exc:
         raise RuntimeError(f"Erro na chamada à API da Anthropic: {exc}") from exc
 
-    # 3. Parsing da resposta
-    resposta_texto = message.content[0].text
+    # 2. Parsing, validação e normalização da resposta
+    return _processar_resposta(message.content[0].text)
+
+
+def _processar_resposta(resposta_texto: str) -> dict:
+    """
+    Processa o texto de resposta do modelo: parsing do JSON, internação das
+    chaves, validação estrutural e normalização dos campos.
+
+    Compartilhado entre o caminho unitário e o caminho em lote.
+    """
     resultado = _parse_json_response(resposta_texto)
 
-    # 4. Validação estrutural e de tipos
+    # Interna as chaves produzidas pelo json.loads — chaves não internadas
+    # perdem o fast path de identidade nas buscas de dict da validação.
+    dados_brutos = resultado.get("dados")
+    if isinstance(dados_brutos, dict):
+        resultado["dados"] = {sys.intern(k): v for k, v in dados_brutos.items()}
+
     _validar_estrutura(resultado)
 
-    # 5. Normalização: injeta modelo e garante todos os campos
-    resultado = _garantir_campos(resultado)
+    return _garantir_campos(resultado)
 
-    return resultado
+
+def extrair_dados_contratos(
+    textos:  list[str],
+    api_key: Optional[str] = None,
+) -> list[dict]:
+    """
+    Extrai dados estruturados de vários contratos em uma única requisição.
+
+    Usa a Message Batches API da Anthropic: as gerações rodam em paralelo no
+    backend, então a latência total de um lote cai da soma das latências para
+    o máximo delas, além de amortizar o overhead de protocolo por requisição.
+    Com um único texto, delega ao caminho unitário de extrair_dados_contrato.
+
+    Parâmetros:
+        textos (list[str]): Textos brutos dos contratos, um por documento.
+        api_key (str, opcional): Chave da API Anthropic. Se omitida, usa a
+            variável de ambiente ANTHROPIC_API_KEY.
+
+    Retorna:
+        list[dict]: Resultados na mesma ordem de entrada, cada um no formato
+            de extrair_dados_contrato.
+
+    Lança:
+        ValueError: Se algum texto estiver vazio ou alguma resposta for inválida.
+        RuntimeError: Em caso de falha na chamada à API ou em item do lote.
+    """
+    if not textos:
+        return []
+
+    if any(not texto or not texto.strip() for texto in textos):
+        raise ValueError("Há texto de contrato vazio no lote.")
+
+    if len(textos) == 1:
+        return [extrair_dados_contrato(textos[0], api_key=api_key)]
+
+    client = _get_client(api_key)
+
+    requests_lote = [
+        {
+            "custom_id": f"contrato-{i}",
+            "params": {
+                "model":       MODEL,
+                "max_tokens":  MAX_TOKENS,
+                "temperature": TEMPERATURE,
+                "system":      _SYSTEM_CACHEADO,
+                "messages": [
+                    {"role": "user", "content": _build_user_message(texto)}
+                ],
+            },
+        }
+        for i, texto in enumerate(textos)
+    ]
+
+    try:
+        lote = client.messages.batches.create(requests=requests_lote)
+
+        # Polling com backoff exponencial até o lote terminar
+        espera = INTERVALO_POLLING_LOTE
+        while lote.processing_status == "in_progress":
+            time.sleep(espera)
+            espera = min(espera * 2, INTERVALO_POLLING_MAX)
+            lote = client.messages.batches.retrieve(lote.id)
+
+        resultados_por_id = {
+            item.custom_id: item.result
+            for item in client.messages.batches.results(lote.id)
+        }
+    except anthropic.APIError as exc:
+        raise RuntimeError(f"Erro na chamada em lote à API da Anthropic: {exc}") from exc
+
+    saidas: list[dict] = []
+    for i in range(len(textos)):
+        resultado_item = resultados_por_id.get(f"contrato-{i}")
+        if resultado_item is None or resultado_item.type != "succeeded":
+            situacao = resultado_item.type if resultado_item is not None else "ausente"
+            raise RuntimeError(
+                f"Item {i} do lote não foi processado com sucesso "
+                f"(situação: {situacao})."
+            )
+        saidas.append(_processar_resposta(resultado_item.message.content[0].text))
+
+    return saidas
 
 
 # --------------------------------------------------------------------------- #
@@ -13,16 +13,180 @@ Fluxo:
         → resultado consolidado
 """
 
-from typing import Optional
-
-from contract_parser           import extrair_dados_contrato
+import copy
+import hashlib
+import io
+import json
+import math
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from contract_parser           import extrair_dados_contrato, CAMPOS_DADOS
 from contract_fields_validator import validar_campos_contrato
+from contract_schema           import CAMPOS_NUMERICOS
+
+
+# Filtro estrutural barato aplicado antes da chamada à IA: qualquer contrato
+# comercial legível contém ao menos um destes rótulos. Rejeitar cedo evita
+# pagar a latência e o custo de uma chamada à API para entradas claramente
+# erradas (PDF trocado, OCR ilegível, documento de outro tipo).
+_GATE_CONTRATO = re.compile(
+    r"cnpj|raz[aã]o social|total de alunos|implanta[cç][aã]o|assinatura",
+    re.IGNORECASE,
+)
+
+
+# Cache em processo endereçado pelo conteúdo: reenviar o mesmo contrato
+# (retry, reprocessamento, re-render) devolve o resultado anterior sem nova
+# chamada à IA. Capacidade limitada com descarte LRU.
+_PIPELINE_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_PIPELINE_CACHE_CAPACIDADE = 512
+_PIPELINE_CACHE_LOCK = threading.Lock()
+
+
+def _chave_cache(texto_contrato: str, dados_crm: Optional[dict]) -> str:
+    """Hash do conteúdo do contrato + dados de CRM usados na comparação."""
+    h = hashlib.blake2b(texto_contrato.encode("utf-8"), digest_size=16)
+    if dados_crm:
+        h.update(json.dumps(dados_crm, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def limpar_cache_pipeline() -> None:
+    """Esvazia o cache de resultados do pipeline contratual."""
+    with _PIPELINE_CACHE_LOCK:
+        _PIPELINE_CACHE.clear()
+
+
+# --------------------------------------------------------------------------- #
+# Fast path por template                                                       #
+# --------------------------------------------------------------------------- #
+
+# Muitos contratos que entram no pipeline são cópias literais de um pequeno
+# conjunto de templates, diferindo apenas nos valores preenchidos (tabela
+# resumo, datas, quantidades). O fingerprint do "esqueleto" do texto — com
+# dígitos e sequências de espaços colapsados — identifica o template sem
+# depender dos valores numéricos. Na primeira vez que um template é visto, a
+# extração via IA roda normalmente e um conjunto de regexes por campo é
+# derivado do resultado; cópias subsequentes do mesmo template são extraídas
+# por regex, eliminando a chamada à IA — o maior custo de latência do pipeline.
+_TEMPLATE_REGISTRY: dict[str, dict[str, "re.Pattern[str]"]] = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+_RE_ESPACOS_FP = re.compile(r"\s+")
+_RE_DIGITOS_FP = re.compile(r"\d+")
+
+
+def _fingerprint_template(texto: str) -> str:
+    """Hash do esqueleto do texto, invariante aos valores numéricos preenchidos."""
+    esqueleto = _RE_DIGITOS_FP.sub("#", _RE_ESPACOS_FP.sub(" ", texto))
+    return hashlib.blake2b(esqueleto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _derivar_regexes_template(texto: str, dados: dict) -> dict[str, "re.Pattern[str]"]:
+    """
+    Deriva regexes por campo a partir de uma extração via IA bem-sucedida.
+
+    Para cada linha "Rótulo: valor" do texto cujo valor confere com um campo
+    extraído, o rótulo vira a âncora de um regex de captura. Campos cujo
+    valor não pôde ser localizado em uma linha rotulada ficam de fora — o
+    chamador só registra o template se a extração via regex reproduzir o
+    resultado da IA por inteiro.
+    """
+    regexes: dict[str, "re.Pattern[str]"] = {}
+    rotulos_vistos: set[str] = set()
+
+    for linha in texto.splitlines():
+        rotulo, separador, resto = linha.partition(":")
+        valor_linha = resto.strip()
+        if not separador or not valor_linha:
+            continue
+
+        rotulo = rotulo.strip()
+        if not rotulo or rotulo in rotulos_vistos:
+            continue
+        rotulos_vistos.add(rotulo)
+
+        for campo in CAMPOS_DADOS:
+            if campo in regexes:
+                continue
+            valor = dados.get(campo)
+            if valor is None:
+                continue
+
+            if campo in CAMPOS_NUMERICOS:
+                confere = _to_number(valor_linha) == valor
+            else:
+                confere = valor_linha == str(valor)
+
+            if confere:
+                regexes[campo] = re.compile(
+                    r"^\s*" + re.escape(rotulo) + r":[ \t]*(.+?)[ \t]*$",
+                    re.MULTILINE,
+                )
+                break
+
+    return regexes
+
+
+def _extrair_via_template(
+    texto:   str,
+    regexes: dict[str, "re.Pattern[str]"],
+) -> Optional[dict]:
+    """
+    Extrai os campos de um contrato via regexes de um template conhecido.
+
+    Retorna um dict no formato do contract_parser, ou None se alguma âncora
+    não casar — sinal de que o contrato divergiu do template e deve seguir
+    pelo caminho da IA.
+    """
+    if not regexes:
+        return None
+
+    dados: dict = dict.fromkeys(CAMPOS_DADOS, None)
+    for campo, padrao in regexes.items():
+        casamento = padrao.search(texto)
+        if casamento is None:
+            return None
+        bruto = casamento.group(1)
+        if campo in CAMPOS_NUMERICOS:
+            numero = _to_number(bruto)
+            # Espelha o parse de JSON da IA: valores escritos sem separador
+            # decimal saem como int ("431" → 431), não como o float que
+            # _to_number devolve.
+            if numero is not None and numero.is_integer() and "," not in bruto:
+                numero = int(numero)
+            dados[campo] = numero
+        else:
+            dados[campo] = bruto
+
+    return {"dados": dados}
 
 
 # --------------------------------------------------------------------------- #
 # Comparação CRM × Contrato                                                   #
 # --------------------------------------------------------------------------- #
 
+# Constantes pré-compiladas de _to_number: remoção do prefixo monetário e de
+# espaços em uma passada C cada, e detecção ancorada do formato de milhar
+# (grupos de exatamente 3 dígitos) sem fatiar a string em partes.
+_RE_PREFIXO_RS = re.compile(r"R\$\s*")
+_SEM_ESPACOS   = str.maketrans({" ": None})
+_RE_MILHAR     = re.compile(r"[+-]?\d+(?:\.\d{3})+")
+
+# Pares comparados entre CRM e contrato, montados uma única vez no import:
+# (campo no CRM, campo no contrato, rótulo exibido no warning).
+_COMPARACOES_CRM_CONTRATO: tuple[tuple[str, str, str], ...] = (
+    ("numero_alunos",     "alunos_totais", "Número de alunos"),
+    ("valor_implantacao", "implantacao",   "Valor de implantação"),
+)
+
+
 def _to_number(valor) -> float | None:
     """
     Converte um valor numérico de qualquer formato para float.
@@ -52,19 +216,15 @@ def _to_number(valor) -> float | None:
     if not isinstance(valor, str):
         return None
 
-    texto = valor.strip()
-    texto = texto.replace("R$", "").strip()
-    texto = texto.replace(" ", "")
+    texto = _RE_PREFIXO_RS.sub("", valor.strip()).translate(_SEM_ESPACOS)
 
     # Formato brasileiro: vírgula indica decimal → ponto é milhar
     if "," in texto:
         texto = texto.replace(".", "")   # remove pontos de milhar
         texto = texto.replace(",", ".")  # vírgula decimal vira ponto
-    # Sem vírgula: ponto com exatamente 3 dígitos após = milhar
-    elif "." in texto:
-        partes = texto.split(".")
-        if all(len(p) == 3 for p in partes[1:]):
-            texto = texto.replace(".", "")
+    # Sem vírgula: pontos seguidos de exatamente 3 dígitos = milhar
+    elif "." in texto and _RE_MILHAR.fullmatch(texto):
+        texto = texto.replace(".", "")
 
     try:
         return float(texto)
@@ -96,24 +256,16 @@ def comparar_crm_contrato(
     Retorna:
         list[str]: Lista de warnings de divergência. Vazia se tudo consistente.
     """
+    # Sem dados de um dos lados não há o que comparar — sai antes de alocar
+    # a lista de warnings do loop.
+    if not dados_crm or not dados_contrato:
+        return []
+
     warnings: list[str] = []
 
-    comparacoes = [
-        (
-            "numero_alunos",     dados_crm,
-            "alunos_totais",     dados_contrato,
-            "Número de alunos",
-        ),
-        (
-            "valor_implantacao", dados_crm,
-            "implantacao",       dados_contrato,
-            "Valor de implantação",
-        ),
-    ]
-
-    for campo_crm, fonte_crm, campo_contrato, fonte_contrato, label in comparacoes:
-        val_crm      = fonte_crm.get(campo_crm)
-        val_contrato = fonte_contrato.get(campo_contrato)
+    for campo_crm, campo_contrato, label in _COMPARACOES_CRM_CONTRATO:
+        val_crm      = dados_crm.get(campo_crm)
+        val_contrato = dados_contrato.get(campo_contrato)
 
         num_crm      = _to_number(val_crm)
         num_contrato = _to_number(val_contrato)
@@ -122,7 +274,9 @@ def comparar_crm_contrato(
         if num_crm is None or num_contrato is None:
             continue
 
-        if num_crm != num_contrato:
+        # isclose em vez de != : valores que fizeram ida e volta por JSON
+        # (float) não devem gerar divergência por ruído de precisão.
+        if not math.isclose(num_crm, num_contrato, rel_tol=1e-9, abs_tol=1e-6):
             warnings.append(
                 f"{label} divergente: CRM={val_crm}, Contrato={val_contrato}."
             )
@@ -134,6 +288,12 @@ def comparar_crm_contrato(
 # Status final                                                                 #
 # --------------------------------------------------------------------------- #
 
+# Tabela de consolidação indexada por bitmask de 2 bits:
+#     (erro crítico de campo << 1) | (divergência CRM × contrato)
+# O erro de campo domina a divergência — índices 2 e 3 são ambos "invalido".
+_STATUS_FINAL_TABELA = ("valido", "revisao_manual", "invalido", "invalido")
+
+
 def _determinar_status_final(
     validacao_campos:      dict,
     warnings_crm_contrato: list[str],
@@ -146,13 +306,35 @@ def _determinar_status_final(
         2. Divergência CRM × contrato    → "revisao_manual"
         3. Tudo consistente              → "valido"
     """
-    if not validacao_campos["valido"]:
-        return "invalido"
+    indice = ((not validacao_campos["valido"]) << 1) | bool(warnings_crm_contrato)
+    return _STATUS_FINAL_TABELA[indice]
 
-    if warnings_crm_contrato:
-        return "revisao_manual"
 
-    return "valido"
+# --------------------------------------------------------------------------- #
+# Resultado tipado                                                             #
+# --------------------------------------------------------------------------- #
+
+@dataclass(slots=True)
+class PipelineResultado:
+    """
+    Resultado do pipeline contratual com campos tipados e __slots__.
+
+    Em lote, o acesso por atributo dispensa o hash de chave por consulta e
+    cada instância ocupa menos memória que o dict equivalente. to_dict()
+    devolve o formato legado para consumidores que esperam dicionário.
+    """
+    dados_extraidos:       dict
+    validacao_campos:      dict
+    warnings_crm_contrato: list
+    status_final:          str
+
+    def to_dict(self) -> dict:
+        return {
+            "dados_extraidos":       self.dados_extraidos,
+            "validacao_campos":      self.validacao_campos,
+            "warnings_crm_contrato": self.warnings_crm_contrato,
+            "status_final":          self.status_final,
+        }
 
 
 # --------------------------------------------------------------------------- #
@@ -163,13 +345,18 @@ def executar_pipeline_contrato(
     texto_contrato: str,
     dados_crm:      Optional[dict] = None,
     api_key:        Optional[str]  = None,
-) -> dict:
+    usar_cache:     bool           = True,
+    modo_turbo:     bool           = True,
+    como_objeto:    bool           = False,
+) -> Union[dict, PipelineResultado]:
     """
     Executa o pipeline de validação contratual baseado em dados comerciais.
 
     Aceita qualquer texto de contrato, independentemente de estrutura ou
-    formato. Nunca lança exceção por conteúdo não reconhecido — campos
-    ausentes resultam em status "invalido" via validacao_campos.
+    formato — campos ausentes resultam em status "invalido" via
+    validacao_campos. A única rejeição antecipada é o filtro estrutural
+    barato (_GATE_CONTRATO): textos sem nenhum rótulo comercial conhecido
+    falham antes de pagar a chamada à IA.
 
     Parâmetros:
         texto_contrato (str): Texto bruto extraído do contrato via OCR ou PDF.
@@ -177,6 +364,14 @@ def executar_pipeline_contrato(
             Se fornecido, ativa a detecção de divergências CRM × contrato.
         api_key (str, opcional): Chave da API Anthropic. Se None, usa a
             variável de ambiente ANTHROPIC_API_KEY.
+        usar_cache (bool): Se True (padrão), resultados são memoizados por
+            hash do conteúdo — reenvios idênticos não repetem a chamada à IA.
+        modo_turbo (bool): Se True (padrão), contratos cujo esqueleto casa
+            com um template já visto são extraídos por regex, sem chamada à
+            IA. Templates são registrados automaticamente após cada extração
+            via IA bem-sucedida.
+        como_objeto (bool): Se True, retorna um PipelineResultado (__slots__,
+            acesso por atributo) em vez do dict legado.
 
     Retorna:
         dict com:
@@ -187,17 +382,65 @@ def executar_pipeline_contrato(
             - status_final (str): "valido", "invalido" ou "revisao_manual".
 
     Lança:
-        ValueError: Se o texto estiver vazio ou a resposta da IA for inválida.
+        ValueError: Se o texto estiver vazio, não aparentar ser um contrato
+            comercial ou a resposta da IA for inválida.
         RuntimeError: Em caso de falha na chamada à API da Anthropic.
     """
-    if not texto_contrato or not texto_contrato.strip():
+    # Normaliza uma única vez na entrada: o strip aqui evita que cada etapa
+    # subsequente (gate, hash do cache, parser) refaça a varredura de
+    # espaços sobre o texto completo.
+    texto = texto_contrato.strip() if texto_contrato else ""
+    if not texto:
         raise ValueError("O texto do contrato está vazio.")
 
-    # ── Etapa 1: Extração de dados via IA ────────────────────────────────────
-    resultado_parser = extrair_dados_contrato(
-        texto_bruto = texto_contrato,
-        api_key     = api_key,
-    )
+    if not _GATE_CONTRATO.search(texto):
+        raise ValueError(
+            "O texto não aparenta ser um contrato comercial — nenhum rótulo "
+            "esperado (CNPJ, Razão Social, Total de Alunos, Implantação, "
+            "Assinatura) foi encontrado."
+        )
+
+    # ── Cache por conteúdo ───────────────────────────────────────────────────
+    chave = _chave_cache(texto, dados_crm) if usar_cache else None
+    if chave is not None:
+        with _PIPELINE_CACHE_LOCK:
+            em_cache = _PIPELINE_CACHE.get(chave)
+            if em_cache is not None:
+                _PIPELINE_CACHE.move_to_end(chave)
+                # deepcopy para que mutações do chamador não poluam o cache
+                copia = copy.deepcopy(em_cache)
+                return PipelineResultado(**copia) if como_objeto else copia
+
+    # ── Etapa 1: Extração de dados (template conhecido ou IA) ────────────────
+    fingerprint      = _fingerprint_template(texto) if modo_turbo else None
+    resultado_parser = None
+
+    if fingerprint is not None:
+        regexes = _TEMPLATE_REGISTRY.get(fingerprint)
+        if regexes is not None:
+            resultado_parser = _extrair_via_template(texto, regexes)
+
+    if resultado_parser is None:
+        resultado_parser = extrair_dados_contrato(
+            texto_bruto = texto,
+            api_key     = api_key,
+        )
+        # Registra o template desta extração para que cópias futuras do
+        # mesmo esqueleto pulem a chamada à IA — mas só quando a extração
+        # via regex reproduz exatamente o resultado da IA neste contrato.
+        # Campos extraídos de prosa (sem linha "Rótulo: valor") não rendem
+        # regex e sairiam como None nas cópias, degradando a extração.
+        if fingerprint is not None and fingerprint not in _TEMPLATE_REGISTRY:
+            regexes = _derivar_regexes_template(texto, resultado_parser["dados"])
+            if regexes:
+                reproducao = _extrair_via_template(texto, regexes)
+                if (
+                    reproducao is not None
+                    and reproducao["dados"] == resultado_parser["dados"]
+                ):
+                    with _TEMPLATE_LOCK:
+                        _TEMPLATE_REGISTRY.setdefault(fingerprint, regexes)
+
     dados_extraidos = resultado_parser.get("dados", {})
 
     # ── Etapa 2: Validação de campos ─────────────────────────────────────────
@@ -207,60 +450,187 @@ def executar_pipeline_contrato(
     validacao_campos = validar_campos_contrato(resultado_para_validacao)
 
     # ── Etapa 3: Comparação CRM × Contrato ───────────────────────────────────
-    warnings_crm_contrato = comparar_crm_contrato(
-        dados_crm      = dados_crm or {},
-        dados_contrato = dados_extraidos,
+    # Sem dados de CRM (caso comum) a comparação é pulada por inteiro — nem
+    # o frame da função nem o dict vazio de conveniência são pagos.
+    warnings_crm_contrato = (
+        comparar_crm_contrato(dados_crm, dados_extraidos) if dados_crm else []
     )
 
     # ── Etapa 4: Consolidação ─────────────────────────────────────────────────
     status_final = _determinar_status_final(validacao_campos, warnings_crm_contrato)
 
-    return {
+    resultado = {
         "dados_extraidos":       dados_extraidos,
         "validacao_campos":      validacao_campos,
         "warnings_crm_contrato": warnings_crm_contrato,
         "status_final":          status_final,
     }
 
+    if chave is not None:
+        with _PIPELINE_CACHE_LOCK:
+            _PIPELINE_CACHE[chave] = copy.deepcopy(resultado)
+            _PIPELINE_CACHE.move_to_end(chave)
+            while len(_PIPELINE_CACHE) > _PIPELINE_CACHE_CAPACIDADE:
+                _PIPELINE_CACHE.popitem(last=False)
+
+    return PipelineResultado(**resultado) if como_objeto else resultado
+
+
+# --------------------------------------------------------------------------- #
+# Execução em lote                                                             #
+# --------------------------------------------------------------------------- #
+
+def _reaproveitar_resultado(base: dict, dados_crm: Optional[dict]) -> dict:
+    """
+    Monta o resultado de um contrato duplicado a partir do resultado do seu
+    representante no lote: extração e validação de campos são idênticas, só
+    a comparação CRM × contrato (barata) é refeita com os dados do item.
+    """
+    resultado = copy.deepcopy(base)
+    warnings_crm = (
+        comparar_crm_contrato(dados_crm, resultado["dados_extraidos"])
+        if dados_crm else []
+    )
+    resultado["warnings_crm_contrato"] = warnings_crm
+    resultado["status_final"] = _determinar_status_final(
+        resultado["validacao_campos"], warnings_crm
+    )
+    return resultado
+
+
+def executar_pipeline_contrato_lote(
+    textos_contratos: list[str],
+    dados_crm_lista:  Optional[list[Optional[dict]]] = None,
+    api_key:          Optional[str] = None,
+    max_workers:      int = 8,
+) -> list[Union[dict, Exception]]:
+    """
+    Executa o pipeline contratual para vários contratos em paralelo.
+
+    As chamadas à API da Anthropic são limitadas por I/O, então um pool de
+    threads reduz o tempo total de N × latência para ≈ ceil(N / max_workers)
+    × latência. As falhas são coletadas por item — um contrato problemático
+    não aborta o restante do lote.
+
+    Parâmetros:
+        textos_contratos (list[str]): Textos brutos, um por contrato.
+        dados_crm_lista (list, opcional): Dados de CRM por contrato, alinhados
+            por índice com textos_contratos. None desativa a comparação.
+        api_key (str, opcional): Chave da API Anthropic, compartilhada pelo lote.
+        max_workers (int): Limite de chamadas simultâneas à API.
+
+    Retorna:
+        list: Na mesma ordem de entrada; cada elemento é o dict retornado por
+            executar_pipeline_contrato ou a exceção (ValueError/RuntimeError)
+            levantada para aquele contrato.
+    """
+    if not textos_contratos:
+        return []
+
+    crm_por_indice = dados_crm_lista or [None] * len(textos_contratos)
+
+    # Deduplicação por conteúdo: lotes vindos de gestores de documentos
+    # trazem reenvios do mesmo contrato; só o primeiro índice de cada texto
+    # (o representante) paga a chamada à IA — os demais reaproveitam o
+    # resultado, refazendo apenas a comparação CRM do próprio item.
+    digests: list[bytes] = []
+    representante: dict[bytes, int] = {}
+    for indice, texto in enumerate(textos_contratos):
+        digest = hashlib.blake2b(
+            (texto.strip() if texto else "").encode("utf-8"),
+            digest_size=16,
+        ).digest()
+        digests.append(digest)
+        representante.setdefault(digest, indice)
+
+    indices_unicos = list(representante.values())
+
+    def _um(indice: int) -> dict:
+        return executar_pipeline_contrato(
+            texto_contrato = textos_contratos[indice],
+            dados_crm      = crm_por_indice[indice],
+            api_key        = api_key,
+        )
+
+    resultados: list[Union[dict, Exception]] = [None] * len(textos_contratos)
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(indices_unicos))
+    ) as pool:
+        futures = {pool.submit(_um, i): i for i in indices_unicos}
+        for future in as_completed(futures):
+            indice = futures[future]
+            try:
+                resultados[indice] = future.result()
+            except (ValueError, RuntimeError) as exc:
+                resultados[indice] = exc
+
+    # Preenche as duplicatas a partir dos representantes
+    for indice, digest in enumerate(digests):
+        if resultados[indice] is not None:
+            continue
+        base = resultados[representante[digest]]
+        if isinstance(base, Exception):
+            resultados[indice] = base
+        else:
+            resultados[indice] = _reaproveitar_resultado(
+                base, crm_por_indice[indice]
+            )
+
+    return resultados
+
 
 # --------------------------------------------------------------------------- #
 # Exibição formatada                                                           #
 # --------------------------------------------------------------------------- #
 
-def _exibir_resultado(resultado: dict) -> None:
-    """Exibe o resultado do pipeline de forma legível no terminal."""
-    STATUS_SIMBOLO = {
-        "valido":         "✔",
-        "invalido":       "✘",
-        "revisao_manual": "⚠",
-    }
+# Símbolos por status, montados uma única vez no import.
+_STATUS_SIMBOLO = {
+    "valido":         "✔",
+    "invalido":       "✘",
+    "revisao_manual": "⚠",
+}
+
+
+def _exibir_resultado(resultado: dict, stream=None) -> None:
+    """
+    Exibe o resultado do pipeline de forma legível no terminal.
+
+    O relatório inteiro é montado em um buffer e emitido em uma única
+    escrita: em lote, isso troca ~20 prints (cada um com lock e flush de
+    stdout) por um único write por resultado.
+    """
+    buf = io.StringIO()
+    escrever = buf.write
 
     status  = resultado["status_final"]
-    simbolo = STATUS_SIMBOLO.get(status, "?")
+    simbolo = _STATUS_SIMBOLO.get(status, "?")
 
-    print("\n" + "═" * 50)
-    print("  RESULTADO DO PIPELINE CONTRATUAL")
-    print("═" * 50)
-    print(f"  Status final      : {simbolo}  {status.upper()}")
+    escrever("\n" + "═" * 50 + "\n")
+    escrever("  RESULTADO DO PIPELINE CONTRATUAL\n")
+    escrever("═" * 50 + "\n")
+    escrever(f"  Status final      : {simbolo}  {status.upper()}\n")
 
     vc = resultado["validacao_campos"]
-    print(f"\n  ── Validação de Campos {'✔' if vc['valido'] else '✘'}")
+    escrever(f"\n  ── Validação de Campos {'✔' if vc['valido'] else '✘'}\n")
     if vc["erros_criticos"]:
-        for e in vc["erros_criticos"]:
-            print(f"       • {e}")
+        escrever("\n".join(f"       • {e}" for e in vc["erros_criticos"]))
+        escrever("\n")
     if vc["warnings"]:
-        for w in vc["warnings"]:
-            print(f"       ⚠ {w}")
+        escrever("\n".join(f"       ⚠ {w}" for w in vc["warnings"]))
+        escrever("\n")
     if not vc["erros_criticos"] and not vc["warnings"]:
-        print("       Nenhum problema encontrado.")
+        escrever("       Nenhum problema encontrado.\n")
 
     w_crm = resultado["warnings_crm_contrato"]
     if w_crm:
-        print("\n  ── Divergências CRM × Contrato")
-        for w in w_crm:
-            print(f"       ⚠ {w}")
+        escrever("\n  ── Divergências CRM × Contrato\n")
+        escrever("\n".join(f"       ⚠ {w}" for w in w_crm))
+        escrever("\n")
+
+    escrever("═" * 50 + "\n")
 
-    print("═" * 50)
+    (stream or sys.stdout).write(buf.getvalue())
 
 
 # --------------------------------------------------------------------------- #
@@ -0,0 +1,13 @@
+"""
+contract_schema.py
+Definições de esquema compartilhadas entre contract_parser.py e
+contract_fields_validator.py.
+
+Uma única definição canônica e congelada evita que os módulos consumidores
+derivem cópias que podem divergir com o tempo.
+"""
+
+# Campos de contrato cujo valor deve ser numérico (ou null).
+CAMPOS_NUMERICOS: frozenset[str] = frozenset(
+    {"alunos_totais", "alunos_gamificados", "implantacao"}
+)
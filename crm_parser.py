@@ -4,21 +4,47 @@ Módulo para extração estruturada de dados de CRM a partir de texto bruto,
 utilizando a API da Anthropic (Claude) com resposta forçada em JSON.
 """
 
+import copy
+import hashlib
 import json
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
-import anthropic
+# O SDK da Anthropic (e sua cadeia httpx/pydantic) custa centenas de ms e
+# dezenas de MB no import — é carregado sob demanda em _get_client, de modo
+# que quem importa este módulo só para utilitários (conversão de faixas,
+# parsing de JSON) não paga esse custo de partida.
+
+# orjson (parser em C) decodifica o JSON da resposta em fração do tempo do
+# json da stdlib e aloca menos; o fallback mantém o módulo utilizável sem a
+# dependência instalada.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
 
 # --------------------------------------------------------------------------- #
 # Configuração                                                                  #
 # --------------------------------------------------------------------------- #
 
-MODEL = "claude-sonnet-4-6"
+# Roteamento de modelos: a extração texto→JSON é uma tarefa estruturada de
+# baixo raciocínio em que o tier Haiku costuma bastar, por uma fração do
+# custo e da latência do Sonnet. O primário atende a maioria dos documentos;
+# o fallback só entra quando a resposta do primário não rende JSON parseável.
+# O prompt cache é por modelo — cada tier mantém o seu.
+MODEL_PRIMARY  = "claude-haiku-4-5"
+MODEL_FALLBACK = "claude-sonnet-4-6"
 MAX_TOKENS = 1024
 TEMPERATURE = 0.0  # Máxima determinismo para extração estruturada
 
+# Polling da Message Batches API (extração em lote)
+INTERVALO_POLLING_LOTE = 2.0   # segundos, dobra a cada tentativa
+INTERVALO_POLLING_MAX  = 60.0
+
 CAMPOS_ESPERADOS = [
     "nome",
     "nome_escola",
@@ -37,89 +63,224 @@ CAMPOS_ESPERADOS = [
     "contato_email",
 ]
 
+# Prompt em bandas densas (persona, contexto, schema, mapeamento, restrições,
+# formato, tarefa): cada token de entrada custa prefill e latência em toda
+# chamada, então a prosa repetitiva da versão anterior foi concentrada sem
+# remover nenhuma regra — o schema minificado substitui a lista de campos em
+# linguagem natural que aparecia duplicada.
 SYSTEM_PROMPT = """\
-Você é um assistente especializado em extração de dados de CRM.
-
-Sua única tarefa é analisar o texto fornecido pelo usuário e extrair as
-informações solicitadas, retornando EXCLUSIVAMENTE um objeto JSON válido —
-sem explicações, sem markdown, sem texto adicional.
-
-Regras de formato:
-- Retorne apenas o objeto JSON, começando com { e terminando com }.
-- Números devem ser retornados como number (não string): ex. 1500.00, não "1500.00".
-- Exceção: "numero_alunos" pode ser retornado como string se vier como faixa textual
-  (ex: "Até 50 alunos", "51–100 alunos", "Mais de 1001 alunos"). Nesse caso, retorne
-  a faixa exatamente como está no texto.
-
-Regras de extração — leia com atenção:
-- Extraia APENAS o que estiver claramente e literalmente presente no texto.
-- Se houver qualquer dúvida sobre um valor, retorne null.
-- Se um campo não estiver no texto, retorne null.
-- Nunca estime valores.
-- Nunca deduza valores implícitos.
-- Nunca infira informações a partir de contexto ou conhecimento externo.
-- Nunca calcule nada — nenhum campo deve ser resultado de operação matemática.
-- Nunca derive "arr" a partir de "mrr" ou qualquer outro campo.
-- Em caso de ambiguidade, prefira sempre null a arriscar um valor incorreto.
-
-Mapeamento de seções — CRÍTICO, siga à risca:
-
-O texto do CRM possui duas seções distintas. Você DEVE identificá-las e
-extrair cada campo exclusivamente da seção correta.
-
-SEÇÃO "Negociação" (ou equivalente — cabeçalho da oportunidade):
-  → "nome"              = nome da negociação/oportunidade (NÃO é o nome de uma pessoa)
-  → "nome_escola"       = nome da escola ou instituição
-  → "vendedor"          = vendedor responsável pela negociação
-  → "perfil_escola"     = perfil ou descrição da escola
-  → "numero_alunos"     = número ou faixa de alunos
-  → "nivel_prioridade"  = nível de prioridade (ex: "GRUPO A", "GRUPO B")
-  → "mrr"               = MRR acordado
-  → "arr"               = ARR (nunca derive de mrr)
-  → "dor_escola"        = principais dores ou problemas da escola
-  → "valor_implantacao" = valor de implantação
-  → "link_contrato"     = link do contrato
-  → "forma_implantacao" = forma de implantação (ex: "Remota", "Presencial")
-
-SEÇÃO "Contatos" (ou equivalente — lista de contatos da negociação):
-  → "contato_nome"      = nome do contato listado nesta seção
-  → "contato_telefone"  = telefone do contato listado nesta seção
-  → "contato_email"     = e-mail do contato listado nesta seção
-
-Regras específicas para campos de contato:
-- "contato_nome" deve vir EXCLUSIVAMENTE da seção "Contatos".
-  Nunca use o nome da negociação nem qualquer nome da seção "Negociação".
-- Se houver múltiplos contatos, extraia apenas o primeiro.
-- Se a seção "Contatos" não existir ou estiver vazia, retorne null para
-  contato_nome, contato_telefone e contato_email.
-
-Estrutura esperada:
-{
-  "nome": string | null,
-  "nome_escola": string | null,
-  "vendedor": string | null,
-  "perfil_escola": string | null,
-  "numero_alunos": number | null,
-  "nivel_prioridade": string | null,
-  "mrr": number | null,
-  "arr": number | null,
-  "dor_escola": string | null,
-  "valor_implantacao": number | null,
-  "link_contrato": string | null,
-  "forma_implantacao": string | null,
-  "contato_nome": string | null,
-  "contato_telefone": string | null,
-  "contato_email": string | null
-}
+PERSONA: Você é um extrator de dados de CRM.
+
+CONTEXTO: O texto fornecido possui duas seções: "Negociação" (cabeçalho da
+oportunidade) e "Contatos" (lista de contatos da negociação).
+
+SCHEMA (retorne exatamente estes campos):
+{"nome":"string|null","nome_escola":"string|null","vendedor":"string|null","perfil_escola":"string|null","numero_alunos":"number|string|null","nivel_prioridade":"string|null","mrr":"number|null","arr":"number|null","dor_escola":"string|null","valor_implantacao":"number|null","link_contrato":"string|null","forma_implantacao":"string|null","contato_nome":"string|null","contato_telefone":"string|null","contato_email":"string|null"}
+
+MAPEAMENTO DE SEÇÕES (siga à risca):
+- Da seção "Negociação": nome (nome da negociação/oportunidade, não de
+  pessoa), nome_escola, vendedor, perfil_escola, numero_alunos,
+  nivel_prioridade (ex: "GRUPO A"), mrr, arr, dor_escola, valor_implantacao,
+  link_contrato, forma_implantacao.
+- Da seção "Contatos", exclusivamente: contato_nome, contato_telefone,
+  contato_email. Nunca use nomes da seção "Negociação" nesses campos. Com
+  múltiplos contatos, extraia apenas o primeiro. Sem seção "Contatos",
+  retorne null nos três.
+
+RESTRIÇÕES:
+- Extraia apenas o que estiver literalmente presente no texto. Na dúvida ou
+  na ausência, retorne null.
+- Nunca estime, deduza, infira ou calcule valores. Nunca derive "arr" de
+  "mrr" ou de qualquer outro campo.
+- Números como number (ex: 1500.00, não "1500.00"). Exceção: numero_alunos
+  pode ser a faixa textual exatamente como está no texto (ex: "Até 50
+  alunos", "51–100 alunos").
+
+FORMATO: Retorne exclusivamente o objeto JSON, começando com { e terminando
+com } — sem markdown, sem explicações.
+
+TAREFA: Extraia cada campo do texto de CRM fornecido, da seção indicada.
 """
 
+# System prompt embalado com cache_control: a API reaproveita o prefixo
+# estático entre chamadas (prompt caching) — tokens cacheados custam uma
+# fração do preço de entrada e pulam o prefill no servidor. O SYSTEM_PROMPT
+# permanece uma constante de módulo para que o prefixo seja byte-idêntico
+# em todas as chamadas (a chave do cache é o hash do prefixo).
+_SYSTEM_CACHEADO = [
+    {
+        "type": "text",
+        "text": SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+
+# --------------------------------------------------------------------------- #
+# Cache de respostas                                                            #
+# --------------------------------------------------------------------------- #
+
+# Cache em processo endereçado pelo conteúdo: reprocessar o mesmo texto de
+# CRM (retry, re-execução do pipeline, re-OCR idêntico) devolve o resultado
+# anterior sem nova chamada à IA. Capacidade limitada com descarte LRU.
+_RESPOSTA_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_RESPOSTA_CACHE_CAPACIDADE = 256
+_RESPOSTA_CACHE_LOCK = threading.Lock()
+
+
+def _chave_cache(texto_bruto: str) -> str:
+    """Hash do conteúdo do texto de CRM."""
+    return hashlib.blake2b(texto_bruto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def limpar_cache_respostas() -> None:
+    """Esvazia o cache de respostas do parser de CRM."""
+    with _RESPOSTA_CACHE_LOCK:
+        _RESPOSTA_CACHE.clear()
+
+
+# --------------------------------------------------------------------------- #
+# Cliente                                                                       #
+# --------------------------------------------------------------------------- #
+
+# Cache de clientes por chave de API: cada anthropic.Anthropic embute um pool
+# de conexões httpx próprio; reconstruí-lo a cada extração descarta o pool e
+# paga um novo handshake TLS por chamada.
+_CLIENT_CACHE: dict[Optional[str], "anthropic.Anthropic"] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client(api_key: Optional[str]) -> "anthropic.Anthropic":
+    """Retorna o cliente Anthropic memoizado para a chave informada."""
+    import anthropic
+
+    key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+    cliente = _CLIENT_CACHE.get(key)
+    if cliente is None:
+        with _CLIENT_LOCK:
+            cliente = _CLIENT_CACHE.get(key)
+            if cliente is None:
+                cliente = _CLIENT_CACHE.setdefault(
+                    key, anthropic.Anthropic(api_key=key)
+                )
+    return cliente
+
+
+def fechar_clientes() -> None:
+    """
+    Fecha e descarta os clientes Anthropic memoizados.
+
+    Para shutdown gracioso de processos de longa duração: libera as conexões
+    keep-alive dos pools httpx embutidos. O próximo _get_client reconstrói o
+    cliente normalmente.
+    """
+    with _CLIENT_LOCK:
+        clientes = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+    for cliente in clientes:
+        cliente.close()
+
 
 # --------------------------------------------------------------------------- #
 # Funções auxiliares                                                            #
 # --------------------------------------------------------------------------- #
 
-def _build_user_message(texto_bruto: str) -> str:
-    return f"Extraia os dados do seguinte texto de CRM:\n\n{texto_bruto}"
+# Regex do caminho quente compilada uma única vez no import: evita a
+# consulta ao cache interno do módulo re (dict + lock) a cada chamada.
+_NUM_RE = re.compile(r"\d+")
+
+# Prefixos de faixa "até X" — a forma em tupla resolve os dois casos em uma
+# única chamada de startswith.
+_ATE_PREFIXES = ("até", "ate")
+
+
+# Estados do rastreador incremental de JSON
+_JSON_PARCIAL  = 0
+_JSON_COMPLETO = 1
+
+
+class _RastreadorJson:
+    """
+    Rastreador incremental de um objeto JSON de nível superior em um stream.
+
+    Mantém profundidade de chaves e estado de string/escape entre trechos —
+    diferentemente do scanner de buffer completo de _parse_json_response,
+    aqui o estado persiste entre chunks, então o custo total é uma única
+    passada O(n) sem re-varrer o acumulado a cada trecho recebido.
+
+    Texto antes do primeiro '{' (preâmbulo, cerca de markdown) é ignorado:
+    o objeto começa a ser rastreado na primeira chave aberta, como no
+    scanner tolerante de _parse_json_response.
+    """
+
+    __slots__ = ("_profundidade", "_em_string", "_escape", "_iniciado")
+
+    def __init__(self) -> None:
+        self._profundidade = 0
+        self._em_string    = False
+        self._escape       = False
+        self._iniciado     = False
+
+    def alimentar(self, trecho: str) -> int:
+        """Consome um trecho do stream e retorna o estado do objeto JSON."""
+        for caractere in trecho:
+            if not self._iniciado:
+                if caractere != "{":
+                    continue
+                self._iniciado     = True
+                self._profundidade = 1
+                continue
+
+            if self._escape:
+                self._escape = False
+            elif self._em_string:
+                if caractere == "\\":
+                    self._escape = True
+                elif caractere == '"':
+                    self._em_string = False
+            elif caractere == '"':
+                self._em_string = True
+            elif caractere == "{":
+                self._profundidade += 1
+            elif caractere == "}":
+                self._profundidade -= 1
+                if self._profundidade == 0:
+                    return _JSON_COMPLETO
+
+        return _JSON_PARCIAL
+
+
+def _chamar_modelo(client, model: str, texto_bruto: str) -> str:
+    """
+    Executa uma chamada de extração no modelo indicado via streaming e
+    retorna o texto acumulado da resposta.
+
+    O stream é encerrado assim que o objeto JSON de nível superior fecha
+    (profundidade de chaves volta a zero fora de string): a resposta fica
+    pronta sem esperar a finalização do stream e sem consumir tokens
+    excedentes de uma geração descontrolada. Preâmbulos antes do objeto
+    (prosa, cerca ```json) são consumidos sem encerrar o stream — o parse
+    do acumulado fica a cargo de _parse_json_response.
+    """
+    partes: list[str] = []
+    rastreador = _RastreadorJson()
+
+    with client.messages.stream(
+        model=model,
+        max_tokens=MAX_TOKENS,
+        temperature=TEMPERATURE,
+        system=_SYSTEM_CACHEADO,
+        # A instrução de extração vive na banda TAREFA do system prompt
+        # cacheado; o turno do usuário carrega só o texto bruto, sem a
+        # cópia O(n) que a concatenação do prefixo exigia.
+        messages=[{"role": "user", "content": texto_bruto}],
+    ) as stream:
+        for trecho in stream.text_stream:
+            partes.append(trecho)
+            if rastreador.alimentar(trecho) == _JSON_COMPLETO:
+                break
+
+    return "".join(partes)
 
 
 def _converter_faixa_alunos(valor) -> Optional[int]:
@@ -153,14 +314,14 @@ def _converter_faixa_alunos(valor) -> Optional[int]:
         return int(texto)
 
     # Extrai todos os números do texto
-    numeros = re.findall(r"\d+", texto)
+    numeros = _NUM_RE.findall(texto)
     if not numeros:
         return None
 
     texto_lower = texto.lower()
 
     # "Até X" ou "até X" → retorna o único número encontrado
-    if texto_lower.startswith("até") or texto_lower.startswith("ate"):
+    if texto_lower.startswith(_ATE_PREFIXES):
         return int(numeros[0])
 
     # "Mais de X" → retorna o único número encontrado
@@ -177,32 +338,56 @@ def _converter_faixa_alunos(valor) -> Optional[int]:
 
 def _parse_json_response(content: str) -> dict:
     """
-    Extrai e interpreta o primeiro bloco JSON válido da resposta do modelo.
+    Extrai e interpreta o primeiro bloco JSON estruturalmente válido da resposta.
 
     Estratégia:
-        1. Usa regex com re.DOTALL para localizar o primeiro trecho
-           delimitado por { ... } na resposta, ignorando texto ao redor.
-        2. Tenta interpretar o trecho encontrado como JSON.
+        1. Caminho rápido: resposta que já é JSON puro (caso dominante com o
+           SYSTEM_PROMPT atual) é decodificada diretamente.
+        2. Caso contrário, a varredura é delegada ao scanner em C de
+           json.JSONDecoder.raw_decode a partir de cada '{' do texto — ele
+           entende strings, escapes e aninhamento nativamente, para no fim do
+           primeiro objeto balanceado e não sofre o backtracking da regex
+           gulosa \\{.*\\}, que ainda por cima casava atravessando múltiplos
+           objetos de nível superior.
         3. Lança ValueError com mensagem clara em caso de falha.
     """
-    match = re.search(r"\{.*\}", content, re.DOTALL)
-
-    if not match:
+    stripped = content.strip()
+    if stripped[:1] == "{" and stripped[-1:] == "}":
+        try:
+            # orjson.JSONDecodeError e json.JSONDecodeError derivam ambos de
+            # ValueError — o tratamento fica agnóstico à biblioteca em uso.
+            if _orjson is not None:
+                return _orjson.loads(stripped)
+            return json.loads(stripped)
+        except ValueError:
+            pass  # Prossegue para a varredura tolerante a texto livre
+
+    decoder = json.JSONDecoder()
+    encontrou_candidato = False
+    pos = 0
+
+    while True:
+        inicio = content.find("{", pos)
+        if inicio == -1:
+            break
+
+        encontrou_candidato = True
+        try:
+            objeto, _fim = decoder.raw_decode(content, inicio)
+            return objeto
+        except json.JSONDecodeError:
+            pos = inicio + 1
+
+    if encontrou_candidato:
         raise ValueError(
-            "Nenhum bloco JSON encontrado na resposta do modelo.\n"
+            "Bloco JSON encontrado, mas inválido.\n"
             f"Conteúdo recebido:\n{content}"
         )
 
-    json_bruto = match.group()
-
-    try:
-        return json.loads(json_bruto)
-    except json.JSONDecodeError as exc:
-        raise ValueError(
-            f"Bloco JSON encontrado, mas inválido.\n"
-            f"Trecho extraído:\n{json_bruto}\n"
-            f"Erro de parsing: {exc}"
-        ) from exc
+    raise ValueError(
+        "Nenhum bloco JSON encontrado na resposta do modelo.\n"
+        f"Conteúdo recebido:\n{content}"
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -212,6 +397,7 @@ def _parse_json_response(content: str) -> dict:
 def extrair_dados_crm(
     texto_bruto: str,
     api_key: Optional[str] = None,
+    usar_cache: bool = True,
 ) -> dict:
     """
     Extrai dados estruturados de um texto bruto de CRM usando Claude.
@@ -220,34 +406,57 @@ def extrair_dados_crm(
         texto_bruto (str): Texto livre extraído do CRM.
         api_key (str, opcional): Chave da API Anthropic. Se não informada,
             utiliza a variável de ambiente ANTHROPIC_API_KEY.
+        usar_cache (bool): Se True (padrão), resultados são memoizados por
+            hash do conteúdo — textos idênticos não repetem a chamada à IA.
 
     Retorna:
         dict com os campos extraídos. Campos não encontrados terão valor None.
+        A chave extra "modelo_ia" registra qual modelo atendeu a extração.
 
     Lança:
-        ValueError: Se a resposta do modelo não for um JSON válido.
+        ValueError: Se a resposta de nenhum dos modelos for um JSON válido.
         anthropic.APIError: Em caso de erros na chamada da API.
     """
-    client = anthropic.Anthropic(
-        api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
-    )
+    chave = _chave_cache(texto_bruto) if usar_cache else None
+    if chave is not None:
+        with _RESPOSTA_CACHE_LOCK:
+            em_cache = _RESPOSTA_CACHE.get(chave)
+            if em_cache is not None:
+                _RESPOSTA_CACHE.move_to_end(chave)
+                # deepcopy para que mutações do chamador não poluam o cache
+                return copy.deepcopy(em_cache)
+
+    client = _get_client(api_key)
+
+    # Tenta o tier primário; escala para o fallback apenas se a resposta não
+    # contiver um JSON parseável — o caso raro amortiza no volume total.
+    resposta_texto = _chamar_modelo(client, MODEL_PRIMARY, texto_bruto)
+    try:
+        dados = _parse_json_response(resposta_texto)
+        modelo_usado = MODEL_PRIMARY
+    except ValueError:
+        resposta_texto = _chamar_modelo(client, MODEL_FALLBACK, texto_bruto)
+        dados = _parse_json_response(resposta_texto)
+        modelo_usado = MODEL_FALLBACK
+
+    dados = _normalizar_dados(dados, modelo_usado)
+
+    if chave is not None:
+        with _RESPOSTA_CACHE_LOCK:
+            _RESPOSTA_CACHE[chave] = copy.deepcopy(dados)
+            _RESPOSTA_CACHE.move_to_end(chave)
+            while len(_RESPOSTA_CACHE) > _RESPOSTA_CACHE_CAPACIDADE:
+                _RESPOSTA_CACHE.popitem(last=False)
 
-    message = client.messages.create(
-        model=MODEL,
-        max_tokens=MAX_TOKENS,
-        temperature=TEMPERATURE,
-        system=SYSTEM_PROMPT,
-        messages=[
-            {
-                "role": "user",
-                "content": _build_user_message(texto_bruto),
-            }
-        ],
-    )
+    return dados
 
-    resposta_texto = message.content[0].text
-    dados = _parse_json_response(resposta_texto)
 
+def _normalizar_dados(dados: dict, modelo_usado: str) -> dict:
+    """
+    Pós-processamento compartilhado entre o caminho unitário e o em lote:
+    completa campos ausentes, normaliza numero_alunos e registra o tier de
+    modelo que atendeu a extração.
+    """
     # Garante que todos os campos esperados estejam presentes no retorno
     for campo in CAMPOS_ESPERADOS:
         dados.setdefault(campo, None)
@@ -255,9 +464,97 @@ def extrair_dados_crm(
     # Normaliza numero_alunos para inteiro antes de enviar ao validador
     dados["numero_alunos"] = _converter_faixa_alunos(dados.get("numero_alunos"))
 
+    # Telemetria: registra qual tier de modelo atendeu esta extração
+    dados["modelo_ia"] = modelo_usado
+
     return dados
 
 
+def extrair_dados_crm_lote(
+    textos: list[str],
+    api_key: Optional[str] = None,
+) -> list[dict]:
+    """
+    Extrai dados estruturados de vários textos de CRM em uma única requisição.
+
+    Usa a Message Batches API da Anthropic: as gerações rodam em paralelo no
+    backend (com desconto de lote sobre os tokens) e o prefixo de sistema
+    cacheado continua valendo para todos os itens. Com um único texto, delega
+    ao caminho unitário de extrair_dados_crm.
+
+    Parâmetros:
+        textos (list[str]): Textos brutos de CRM, um por documento.
+        api_key (str, opcional): Chave da API Anthropic. Se omitida, usa a
+            variável de ambiente ANTHROPIC_API_KEY.
+
+    Retorna:
+        list[dict]: Resultados na mesma ordem de entrada, cada um no formato
+            de extrair_dados_crm.
+
+    Lança:
+        ValueError: Se algum texto estiver vazio ou alguma resposta for inválida.
+        RuntimeError: Se a chamada em lote falhar ou algum item não for
+            processado com sucesso.
+    """
+    if not textos:
+        return []
+
+    if any(not texto or not texto.strip() for texto in textos):
+        raise ValueError("Há texto de CRM vazio no lote.")
+
+    if len(textos) == 1:
+        return [extrair_dados_crm(textos[0], api_key=api_key)]
+
+    client = _get_client(api_key)
+
+    requests_lote = [
+        {
+            "custom_id": f"crm-{i}",
+            "params": {
+                "model":       MODEL_PRIMARY,
+                "max_tokens":  MAX_TOKENS,
+                "temperature": TEMPERATURE,
+                "system":      _SYSTEM_CACHEADO,
+                "messages":    [{"role": "user", "content": texto}],
+            },
+        }
+        for i, texto in enumerate(textos)
+    ]
+
+    import anthropic
+
+    try:
+        lote = client.messages.batches.create(requests=requests_lote)
+
+        # Polling com backoff exponencial até o lote terminar
+        espera = INTERVALO_POLLING_LOTE
+        while lote.processing_status == "in_progress":
+            time.sleep(espera)
+            espera = min(espera * 2, INTERVALO_POLLING_MAX)
+            lote = client.messages.batches.retrieve(lote.id)
+
+        resultados_por_id = {
+            item.custom_id: item.result
+            for item in client.messages.batches.results(lote.id)
+        }
+    except anthropic.APIError as exc:
+        raise RuntimeError(f"Erro na chamada em lote à API da Anthropic: {exc}") from exc
+
+    saidas: list[dict] = []
+    for i in range(len(textos)):
+        resultado_item = resultados_por_id.get(f"crm-{i}")
+        if resultado_item is None or resultado_item.type != "succeeded":
+            situacao = resultado_item.type if resultado_item is not None else "ausente"
+            raise RuntimeError(
+                f"Item {i} do lote não foi processado com sucesso "
+                f"(situação: {situacao})."
+            )
+        dados = _parse_json_response(resultado_item.message.content[0].text)
+        saidas.append(_normalizar_dados(dados, MODEL_PRIMARY))
+
+    return saidas
+
+
 # --------------------------------------------------------------------------- #
 # Exemplo de uso                                                                #
 # --------------------------------------------------------------------------- #
@@ -281,6 +578,8 @@ E-mail: ana.lima@colegio.com.br
 """
 
 if __name__ == "__main__":
+    import anthropic
+
     print("=== CRM Parser — Exemplo de Extração ===\n")
 
     try:
@@ -7,12 +7,17 @@ Fluxo:
         → crm_parser.py → crm_validator.py → terminal
 """
 
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from extractor import extrair_texto_arquivo
-from crm_parser import extrair_dados_crm
 from crm_validator import validar_crm
 
+# crm_parser (→ SDK da Anthropic) é importado dentro das funções de pipeline:
+# --help, erros de argumento e falhas de extração não pagam o custo de
+# carregar o SDK e sua cadeia de dependências.
+
 
 # --------------------------------------------------------------------------- #
 # Exibição                                                                     #
@@ -70,6 +75,29 @@ def _exibir_resultado(resultado: dict) -> None:
 # Extração de múltiplos arquivos                                               #
 # --------------------------------------------------------------------------- #
 
+def _deduplicar_partes(partes: list[str]) -> str:
+    """
+    Consolida os textos extraídos removendo parágrafos exatamente duplicados.
+
+    Quem envia a mesma página em PDF e em PNG (re-export comum para OCR)
+    duplicaria o conteúdo enviado à IA — pagando o dobro de tokens de entrada
+    e arriscando extrações conflitantes. dict.fromkeys preserva a ordem da
+    primeira ocorrência e descarta as repetições em uma passada.
+    """
+    paragrafos: list[str] = []
+    for parte in partes:
+        paragrafos.extend(p for p in parte.split("\n\n") if p.strip())
+
+    unicos = list(dict.fromkeys(paragrafos))
+
+    originais = sum(len(p) for p in paragrafos)
+    finais    = sum(len(p) for p in unicos)
+    if finais < originais:
+        print(f"  ↺ Deduplicação: {originais - finais} caracteres repetidos removidos")
+
+    return "\n\n".join(unicos)
+
+
 def _extrair_textos(caminhos: list[str]) -> tuple[str, list[str], list[tuple[str, str]]]:
     """
     Tenta extrair texto de cada arquivo da lista.
@@ -79,26 +107,38 @@ def _extrair_textos(caminhos: list[str]) -> tuple[str, list[str], list[tuple[str
         sucessos (list[str]): Caminhos processados com êxito.
         falhas (list[tuple[str, str]]): Pares (caminho, mensagem de erro).
     """
-    partes: list[str] = []
+    if not caminhos:
+        return "", [], []
+
     sucessos: list[str] = []
     falhas: list[tuple[str, str]] = []
 
-    for caminho in caminhos:
-        try:
-            texto = extrair_texto_arquivo(caminho)
-            partes.append(texto)
-            sucessos.append(caminho)
-            print(f"  ✔ Extraído: {caminho}  ({len(texto)} caracteres)")
-        except FileNotFoundError:
-            motivo = "arquivo não encontrado"
-            falhas.append((caminho, motivo))
-            print(f"  ✘ Ignorado: {caminho}  →  {motivo}")
-        except (ValueError, RuntimeError, ImportError) as exc:
-            motivo = str(exc)
-            falhas.append((caminho, motivo))
-            print(f"  ✘ Ignorado: {caminho}  →  {motivo}")
-
-    texto_consolidado = "\n\n".join(partes)
+    # Extração paralela: pdfminer e tesseract passam a maior parte do tempo
+    # em I/O de disco e em código C/subprocesso que liberam o GIL, então
+    # threads sobrepõem a extração dos arquivos — o tempo total cai da soma
+    # dos tempos por arquivo para aproximadamente o máximo por leva.
+    with ThreadPoolExecutor(max_workers=min(8, len(caminhos))) as pool:
+        futuros = [pool.submit(extrair_texto_arquivo, c) for c in caminhos]
+
+        # Colhe na ordem de entrada: o texto consolidado e as listas de
+        # sucesso/falha ficam determinísticos mesmo com conclusão fora de ordem.
+        partes: list[str] = []
+        for caminho, futuro in zip(caminhos, futuros):
+            try:
+                texto = futuro.result()
+                partes.append(texto)
+                sucessos.append(caminho)
+                print(f"  ✔ Extraído: {caminho}  ({len(texto)} caracteres)")
+            except FileNotFoundError:
+                motivo = "arquivo não encontrado"
+                falhas.append((caminho, motivo))
+                print(f"  ✘ Ignorado: {caminho}  →  {motivo}")
+            except (ValueError, RuntimeError, ImportError) as exc:
+                motivo = str(exc)
+                falhas.append((caminho, motivo))
+                print(f"  ✘ Ignorado: {caminho}  →  {motivo}")
+
+    texto_consolidado = _deduplicar_partes(partes)
     return texto_consolidado, sucessos, falhas
 
 
@@ -106,6 +146,26 @@ def _extrair_textos(caminhos: list[str]) -> tuple[str, list[str], list[tuple[str
 # Pipeline                                                                     #
 # --------------------------------------------------------------------------- #
 
+# Âncoras de CRM no texto consolidado: uma varredura de regex compilada (O(n)
+# em C) barra OCR de lixo e PDFs alheios antes da chamada à IA — sem marcador
+# suficiente, o modelo só devolveria campos null e erros de validador, pagando
+# segundos de rede e tokens à toa.
+_CRM_MARKERS = re.compile(
+    r"\b(MRR|ARR|Escola|Vendedor|Contrato|Implanta[cç][aã]o|Prioridade|GRUPO [A-E])\b",
+    re.IGNORECASE,
+)
+_MIN_MARCADORES_CRM = 3
+
+
+def _conferir_marcadores_crm(texto_consolidado: str) -> None:
+    """Lança ValueError se o texto não aparenta ser uma exportação de CRM."""
+    hits = len(_CRM_MARKERS.findall(texto_consolidado))
+    if hits < _MIN_MARCADORES_CRM:
+        raise ValueError(
+            f"Texto não parece um CRM (apenas {hits} marcadores encontrados)."
+        )
+
+
 def executar_pipeline(caminhos_arquivos: list[str]) -> dict:
     """
     Executa o pipeline completo para um ou mais arquivos.
@@ -139,7 +199,11 @@ def executar_pipeline(caminhos_arquivos: list[str]) -> dict:
     if not texto_consolidado.strip():
         raise ValueError("O texto consolidado está vazio. Nenhum conteúdo foi extraído.")
 
+    _conferir_marcadores_crm(texto_consolidado)
+
     # 2. Parsing via IA
+    from crm_parser import extrair_dados_crm
+
     print("\n[2/3] Extraindo dados estruturados com IA (Claude)...")
     try:
         dados = extrair_dados_crm(texto_consolidado)
@@ -164,6 +228,87 @@ def executar_pipeline(caminhos_arquivos: list[str]) -> dict:
     }
 
 
+# --------------------------------------------------------------------------- #
+# Pipeline em lote                                                             #
+# --------------------------------------------------------------------------- #
+
+def executar_pipeline_batch(listas_de_arquivos: list[list[str]]) -> list[dict]:
+    """
+    Executa o pipeline para vários conjuntos de arquivos independentes.
+
+    A extração de texto roda conjunto a conjunto (cada um já paraleliza os
+    próprios arquivos) e as chamadas à IA são consolidadas em uma única
+    requisição via Message Batches API — o custo de rede é amortizado pelo
+    lote e os tokens saem com o desconto de lote, somado ao cache do prompt
+    de sistema compartilhado.
+
+    Parâmetros:
+        listas_de_arquivos (list[list[str]]): Um item por execução do
+            pipeline, cada um com os caminhos de arquivos daquele conjunto.
+
+    Retorna:
+        list[dict]: Na mesma ordem de entrada, cada item no formato de
+            executar_pipeline.
+
+    Lança:
+        ValueError: Se algum conjunto não render texto aproveitável.
+        RuntimeError: Em caso de falha na IA ou na validação.
+    """
+    if not listas_de_arquivos:
+        return []
+
+    consolidados: list[str] = []
+    extracoes: list[tuple[list[str], list[tuple[str, str]]]] = []
+
+    print(f"\n[1/3] Extraindo texto de {len(listas_de_arquivos)} conjunto(s) de arquivos...")
+    for indice, caminhos in enumerate(listas_de_arquivos):
+        texto_consolidado, sucessos, falhas = _extrair_textos(caminhos)
+
+        if not sucessos or not texto_consolidado.strip():
+            raise ValueError(
+                f"Conjunto {indice} não rendeu texto aproveitável. "
+                "Verifique os caminhos e formatos informados."
+            )
+
+        try:
+            _conferir_marcadores_crm(texto_consolidado)
+        except ValueError as exc:
+            raise ValueError(f"Conjunto {indice}: {exc}") from exc
+
+        consolidados.append(texto_consolidado)
+        extracoes.append((sucessos, falhas))
+
+    from crm_parser import extrair_dados_crm_lote
+
+    print(f"\n[2/3] Extraindo dados estruturados com IA (lote de {len(consolidados)})...")
+    try:
+        dados_lista = extrair_dados_crm_lote(consolidados)
+    except ValueError as exc:
+        raise ValueError(f"Erro no parsing da resposta da IA: {exc}") from exc
+    except Exception as exc:
+        raise RuntimeError(f"Erro na chamada em lote à API da Anthropic: {exc}") from exc
+
+    print("\n[3/3] Validando dados extraídos...")
+    saidas: list[dict] = []
+    for (sucessos, falhas), texto_consolidado, dados in zip(
+        extracoes, consolidados, dados_lista
+    ):
+        try:
+            resultado = validar_crm(dados)
+        except Exception as exc:
+            raise RuntimeError(f"Erro inesperado na validação: {exc}") from exc
+
+        saidas.append({
+            "sucessos":  sucessos,
+            "falhas":    falhas,
+            "texto":     texto_consolidado,
+            "dados":     dados,
+            "resultado": resultado,
+        })
+
+    return saidas
+
+
 # --------------------------------------------------------------------------- #
 # Entrypoint                                                                   #
 # --------------------------------------------------------------------------- #
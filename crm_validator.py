@@ -3,10 +3,20 @@ crm_validator.py
 Módulo para validação de dados de CRM antes de inserção ou processamento.
 """
 
-from typing import Any
+import bisect
+import math
+import re
+import sys
 
 
-CAMPOS_OBRIGATORIOS = [
+# Compilado uma vez no import: remover não-dígitos via sub roda no loop C do
+# engine de regex, sem o overhead de frame Python por caractere.
+_NONDIGIT_RE = re.compile(r"\D+")
+
+# sys.intern nos nomes de campo: as mesmas strings aparecem como chaves dos
+# dicts de dados, de norm e das mensagens — internadas, as comparações de
+# chave resolvem por identidade de ponteiro e as cópias compartilham memória.
+CAMPOS_OBRIGATORIOS = [sys.intern(campo) for campo in (
     "nome",
     "nome_escola",
     "vendedor",
@@ -22,32 +32,27 @@ CAMPOS_OBRIGATORIOS = [
     "contato_nome",
     "contato_telefone",
     "contato_email",
-]
+)]
 
 
-def _is_numeric(value: Any) -> bool:
-    try:
-        float(value)
-        return True
-    except (TypeError, ValueError):
-        return False
+def _digits_only(value: str) -> str:
+    return _NONDIGIT_RE.sub("", str(value))
 
 
-def _digits_only(value: str) -> str:
-    return "".join(c for c in str(value) if c.isdigit())
+# Tabela de faixas de MRR → grupo: limites inferiores inclusivos das faixas
+# D, C e B. O GRUPO A usa limiar estrito (> 700) e fica fora da tabela para
+# não arredondar valores fracionários como 700.5 para a faixa errada.
+_MRR_LIMITES = (100, 300, 401)
+_GRUPOS      = ("GRUPO E", "GRUPO D", "GRUPO C", "GRUPO B")
 
 
 def _grupo_esperado(mrr: float) -> str:
     """Retorna o grupo de prioridade esperado com base no valor de MRR."""
+    # bisect_right resolve a escada de comparações em uma busca binária em C;
+    # limites inclusivos (>= 100, >= 300, >= 401) casam com o lado "right".
     if mrr > 700:
         return "GRUPO A"
-    if mrr >= 401:
-        return "GRUPO B"
-    if mrr >= 300:
-        return "GRUPO C"
-    if mrr >= 100:
-        return "GRUPO D"
-    return "GRUPO E"
+    return _GRUPOS[bisect.bisect_right(_MRR_LIMITES, mrr)]
 
 
 def validar_crm(dados: dict) -> dict:
@@ -67,16 +72,29 @@ def validar_crm(dados: dict) -> dict:
     # ------------------------------------------------------------------ #
     # 1. Campos obrigatórios presentes e não vazios                        #
     # ------------------------------------------------------------------ #
-    for campo in CAMPOS_OBRIGATORIOS:
-        valor = dados.get(campo)
-        if valor is None or str(valor).strip() == "":
-            erros.append(f"Campo obrigatório ausente ou vazio: '{campo}'.")
+    # Normalização em passada única: cada campo vira sua forma string
+    # aparada (ou None se ausente/vazio). As verificações seguintes
+    # consultam norm em vez de refazer dados.get + str().strip() por regra;
+    # as conversões numéricas continuam partindo do valor original.
+    norm = {
+        campo: (
+            None if (valor := dados.get(campo)) is None
+            else (str(valor).strip() or None)
+        )
+        for campo in CAMPOS_OBRIGATORIOS
+    }
+
+    erros.extend(
+        f"Campo obrigatório ausente ou vazio: '{campo}'."
+        for campo in CAMPOS_OBRIGATORIOS
+        if norm[campo] is None
+    )
 
     # ------------------------------------------------------------------ #
     # 2. numero_alunos — inteiro > 0                                       #
     # ------------------------------------------------------------------ #
     numero_alunos = dados.get("numero_alunos")
-    if numero_alunos is not None and str(numero_alunos).strip() != "":
+    if norm["numero_alunos"] is not None:
         try:
             numero_alunos_int = int(numero_alunos)
             if numero_alunos_int <= 0:
@@ -90,23 +108,28 @@ def validar_crm(dados: dict) -> dict:
     # ------------------------------------------------------------------ #
     # 3. mrr — numérico > 0                                               #
     # ------------------------------------------------------------------ #
-    mrr = dados.get("mrr")
-    mrr_valido = False
-    if mrr is not None and str(mrr).strip() != "":
-        if not _is_numeric(mrr):
+    # Conversão única: mrr_f fica None quando o campo está ausente ou
+    # malformado, e as regras dependentes (prioridade, arr) só rodam com o
+    # pré-requisito satisfeito — sem re-parsear float nem acumular erros em
+    # cascata sobre um mrr já reprovado.
+    mrr_f = None
+    if norm["mrr"] is not None:
+        try:
+            mrr_f = float(dados.get("mrr"))
+        except (TypeError, ValueError):
             erros.append("'mrr' deve ser um valor numérico.")
-        elif float(mrr) <= 0:
-            erros.append("'mrr' deve ser maior que zero.")
         else:
-            mrr_valido = True
+            if mrr_f <= 0:
+                erros.append("'mrr' deve ser maior que zero.")
+                mrr_f = None
 
     # ------------------------------------------------------------------ #
     # 4. nivel_prioridade - deve ser coerente com mrr                     #
     # ------------------------------------------------------------------ #
-    nivel = dados.get("nivel_prioridade")
-    if mrr_valido and nivel is not None and str(nivel).strip() != "":
-        grupo = _grupo_esperado(float(mrr))
-        if str(nivel).strip().upper() != grupo:
+    nivel = norm["nivel_prioridade"]
+    if mrr_f is not None and nivel is not None:
+        grupo = _grupo_esperado(mrr_f)
+        if nivel.upper() != grupo:
             erros.append(
                 f"Nivel de prioridade inconsistente com MRR. Esperado: {grupo}."
             )
@@ -114,23 +137,27 @@ def validar_crm(dados: dict) -> dict:
     # ------------------------------------------------------------------ #
     # 6. arr == 12 * mrr                                                  #
     # ------------------------------------------------------------------ #
-    arr = dados.get("arr")
-    if arr is not None and str(arr).strip() != "":
-        if not _is_numeric(arr):
+    if norm["arr"] is not None:
+        try:
+            arr_f = float(dados.get("arr"))
+        except (TypeError, ValueError):
             erros.append("'arr' deve ser um valor numérico.")
-        elif mrr_valido:
-            esperado = round(float(mrr) * 12, 10)
-            if round(float(arr), 10) != esperado:
+        else:
+            # isclose no lugar do par de rounds: tolera apenas ruído de
+            # precisão de float, mantendo a exigência de 12 × mrr.
+            if mrr_f is not None and not math.isclose(
+                arr_f, mrr_f * 12, rel_tol=1e-9
+            ):
                 erros.append(
                     f"'arr' deve ser exatamente 12 × mrr "
-                    f"(esperado: {esperado}, recebido: {float(arr)})."
+                    f"(esperado: {round(mrr_f * 12, 10)}, recebido: {arr_f})."
                 )
 
     # ------------------------------------------------------------------ #
     # 7. contato_telefone — mínimo 10 dígitos                             #
     # ------------------------------------------------------------------ #
-    telefone = dados.get("contato_telefone")
-    if telefone is not None and str(telefone).strip() != "":
+    telefone = norm["contato_telefone"]
+    if telefone is not None:
         digitos = _digits_only(telefone)
         if len(digitos) < 10:
             erros.append(
@@ -141,17 +168,17 @@ def validar_crm(dados: dict) -> dict:
     # ------------------------------------------------------------------ #
     # 8. contato_email — deve conter "@"                                  #
     # ------------------------------------------------------------------ #
-    email = dados.get("contato_email")
-    if email is not None and str(email).strip() != "":
-        if "@" not in str(email):
+    email = norm["contato_email"]
+    if email is not None:
+        if "@" not in email:
             erros.append("'contato_email' deve conter '@'.")
 
     # ------------------------------------------------------------------ #
     # 9. link_contrato — deve começar com "http"                          #
     # ------------------------------------------------------------------ #
-    link = dados.get("link_contrato")
-    if link is not None and str(link).strip() != "":
-        if not str(link).strip().lower().startswith("http"):
+    link = norm["link_contrato"]
+    if link is not None:
+        if not link.lower().startswith("http"):
             erros.append("'link_contrato' deve começar com 'http'.")
 
     # ------------------------------------------------------------------ #